@@ -5,17 +5,25 @@ import datetime
 import hashlib
 import html
 import pathlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import pandas as pd
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import requests
 import numpy as np
 import openpyxl
+from scipy.spatial import ConvexHull
 from scipy.spatial.distance import pdist, squareform
-from sklearn.manifold import MDS
-from zoneinfo import ZoneInfo
+from scipy import sparse
+from scipy.special import gammaln
+from sklearn.isotonic import IsotonicRegression
+from sklearn.manifold import MDS, TSNE
 import pydeck as pdk
 
 st.set_page_config(layout="wide", page_title="Garden Bird Dashboard", page_icon="🐦")
@@ -488,33 +496,301 @@ def style_fig(fig):
     return fig
 
 
-def assign_time_bucket(hour):
-    if 5 <= hour < 8:
-        return "Dawn (5–8)"
-    elif 8 <= hour < 12:
-        return "Morning (8–12)"
-    elif 12 <= hour < 17:
-        return "Afternoon (12–17)"
-    elif 17 <= hour < 20:
-        return "Dusk (17–20)"
-    else:
-        return "Night (20–5)"
+# Lookup tables: hour (0–23) -> index into TIME_BUCKETS, and month (Jan–Dec)
+# -> index into SEASONS.
+TIME_BUCKETS = list(TIME_BUCKET_COLORS)
+SEASONS = list(SEASON_COLORS)
+TIME_BUCKET_BY_HOUR = np.array([4] * 5 + [0] * 3 + [1] * 4 + [2] * 5 + [3] * 3 + [4] * 4, dtype=np.int8)
+SEASON_BY_MONTH = np.array([3, 3, 0, 0, 0, 1, 1, 1, 2, 2, 2, 3], dtype=np.int8)
 
 
-@st.cache_data
-def compute_nmds(feature_matrix, species_list):
-    dist = squareform(pdist(feature_matrix, metric="braycurtis"))
+def time_buckets(hours):
+    """Time-of-day bucket of each hour, as a categorical."""
+    return pd.Categorical.from_codes(TIME_BUCKET_BY_HOUR[np.asarray(hours, dtype=int)], TIME_BUCKETS)
+
+
+def seasons(months):
+    """Season of each month number, as a categorical."""
+    return pd.Categorical.from_codes(SEASON_BY_MONTH[np.asarray(months, dtype=int) - 1], SEASONS)
+
+
+def season_from_month(month):
+    return SEASONS[SEASON_BY_MONTH[month - 1]]
+
+
+# "Accurate" is the original fit; "Fast" makes a single run from the
+# classical (PCoA) solution and stops early.
+NMDS_MODES = {
+    "Accurate": {"n_init": 10, "max_iter": 500, "eps": 1e-6},
+    "Fast": {"n_init": 1, "max_iter": 300, "eps": 1e-4},
+}
+TSNE_MODES = {
+    "Accurate": {"max_iter": 1000},
+    "Fast": {"max_iter": 500},  # the first 250 iterations are early exaggeration
+}
+
+
+def feature_digest(feature_matrix):
+    """Content hash of a feature matrix, used to key its distance matrix."""
+    values = np.ascontiguousarray(feature_matrix, dtype=float)
+    return hashlib.sha1(str(values.shape).encode() + values.tobytes()).hexdigest()
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def braycurtis_distances(digest, _feature_matrix):
+    return squareform(pdist(_feature_matrix, metric="braycurtis"))
+
+
+def pcoa_coords(dist, n_components=2):
+    """Classical (metric) MDS of a distance matrix: one eigendecomposition."""
+    n = len(dist)
+    centring = np.eye(n) - 1.0 / n
+    gram = -0.5 * centring @ (dist ** 2) @ centring
+    eigenvalues, eigenvectors = np.linalg.eigh(gram)
+    top = np.argsort(eigenvalues)[::-1][:n_components]
+    return eigenvectors[:, top] * np.sqrt(np.maximum(eigenvalues[top], 0))
+
+
+NMDS_MATRICES = ["Species × Peak Activity Time", "Species × Month", "Species × Season"]
+NMDS_DEFAULT_MIN_DETECTIONS = 5
+NMDS_MIN_SPECIES = 5
+
+
+def nmds_feature_matrix(data, matrix_type, min_detections):
+    """Detections per species in each column of the chosen matrix.
+
+    Only species with at least `min_detections` are kept; returns None when
+    fewer than NMDS_MIN_SPECIES qualify.
+    """
+    det_counts = data["Com_Name"].value_counts()
+    valid_species = det_counts[det_counts >= min_detections].index
+    if len(valid_species) < NMDS_MIN_SPECIES:
+        return None
+    ts = data[data["Com_Name"].isin(valid_species)].dropna(subset=["timestamp"])
+
+    if matrix_type == "Species × Peak Activity Time":
+        units = ts["time_bucket"].cat.codes.to_numpy()
+        all_cols = TIME_BUCKETS
+    elif matrix_type == "Species × Month":
+        units = ts["month"].to_numpy() - 1
+        all_cols = list(MONTH_LABELS.values())
+    else:  # Species × Season
+        units = ts["season"].cat.codes.to_numpy()
+        all_cols = SEASONS
+
+    species_codes, species = pd.factorize(ts["Com_Name"], sort=True)
+    counts = np.bincount(species_codes * len(all_cols) + units, minlength=len(species) * len(all_cols))
+    return pd.DataFrame(
+        counts.reshape(len(species), len(all_cols)),
+        index=pd.Index(species, name="Com_Name"),
+        columns=all_cols,
+    )
+
+
+def nmds_feature_values(pivot):
+    """Rows of a feature matrix as proportions."""
+    row_sums = pivot.sum(axis=1).replace(0, 1)
+    return pivot.div(row_sums, axis=0).to_numpy()
+
+
+# While the NMDS page is open, the standard ordinations (every matrix type at
+# the default threshold, accurate fit) for its view are fitted on a
+# background worker, so switching matrix type doesn't wait on a fresh fit.
+NMDS_STORE_SIZE = 12
+NMDS_STORE_SESSIONS = 32
+
+
+@st.cache_resource
+def ordination_store():
+    return {"lock": threading.Lock(), "executor": ThreadPoolExecutor(max_workers=1), "jobs": {}, "latest": {}}
+
+
+def fit_standard_ordination(store, data, view_key, matrix_type):
+    with store["lock"]:
+        wanted = view_key in store["latest"].values()
+    if not wanted:
+        return None  # every session on this view moved on before the job started
+    pivot = nmds_feature_matrix(data, matrix_type, NMDS_DEFAULT_MIN_DETECTIONS)
+    if pivot is None:
+        return {"species": [], "coords": None, "stress": None}
+    dist = squareform(pdist(nmds_feature_values(pivot), metric="braycurtis"))
+    coords, stress, seconds = fit_ordination(dist)
+    return {"species": pivot.index.tolist(), "coords": coords, "stress": stress, "seconds": seconds}
+
+
+def ordination_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def release_standard_ordinations():
+    """Stop wanting this session's standard ordinations (it left the NMDS page)."""
+    store = ordination_store()
+    with store["lock"]:
+        store["latest"].pop(ordination_session_id(), None)
+
+
+def queue_standard_ordinations(data, view_key):
+    """Queue the standard ordinations for this session's view; returns {matrix type: future}.
+
+    Jobs are shared by sessions on the same view, and skipped once no
+    session is on it any more.
+    """
+    store = ordination_store()
+    session_id = ordination_session_id()
+    with store["lock"]:
+        store["latest"].pop(session_id, None)
+        store["latest"][session_id] = view_key
+        while len(store["latest"]) > NMDS_STORE_SESSIONS:
+            store["latest"].pop(next(iter(store["latest"])))
+        jobs = {}
+        for matrix_type in NMDS_MATRICES:
+            key = (view_key, matrix_type)
+            job = store["jobs"].get(key)
+            # Requeue jobs that were skipped or failed
+            if job is None or (job.done() and (job.exception() is not None or job.result() is None)):
+                job = store["executor"].submit(fit_standard_ordination, store, data, view_key, matrix_type)
+                store["jobs"].pop(key, None)
+                store["jobs"][key] = job
+            jobs[matrix_type] = job
+        while len(store["jobs"]) > NMDS_STORE_SIZE:
+            store["jobs"].pop(next(iter(store["jobs"])))
+    return jobs
+
+
+NMDS_MONTH_HULL_COLORS = dict(zip(MONTH_LABELS.values(), [
+    "#c8dfa0", "#aed48a", "#94c974", "#7aaa6a", "#6b9e5e",
+    "#5c8c5c", "#4d7a4d", "#3e683e", "#2d5233", "#3e683e",
+    "#5c8c5c", "#94c974",
+]))
+
+
+def dominant_value(data, column):
+    """Most common value of `column` per species (ties go to the first in sort order)."""
+    counts = data.groupby(["Com_Name", column], observed=True).size().reset_index(name="n")
+    counts[column] = counts[column].astype(str)
+    counts = counts.sort_values(["Com_Name", "n", column], ascending=[True, False, True])
+    return counts.drop_duplicates("Com_Name").set_index("Com_Name")[column]
+
+
+def ordination_layout(data, pivot, coords):
+    """Points with per-species metadata, and convex hulls, for a fitted ordination.
+
+    Hulls group species by the matrix column they peak in; groups with fewer
+    than three species (or collinear ones) get no hull.
+    """
+    species = pivot.index
+    ts = data.dropna(subset=["timestamp"])
+    points = pd.DataFrame({
+        "Species": species,
+        "NMDS1": coords[:, 0],
+        "NMDS2": coords[:, 1],
+        "Diet": dominant_value(data, "Diet").reindex(species).fillna("Unclassified").to_numpy(),
+        "UK_Status": dominant_value(data, "UK_Status").reindex(species).fillna("Unknown").to_numpy(),
+        "Detections": data["Com_Name"].value_counts().reindex(species).to_numpy(),
+        "Dominant_Time_Bucket": dominant_value(ts, "time_bucket").reindex(species).to_numpy(),
+        "Peak_Season": dominant_value(ts, "season").reindex(species).to_numpy(),
+        "_dominant_matrix_cat": pivot.idxmax(axis=1).to_numpy(),
+    })
+
+    hulls = []
+    for group_name, grp in points.groupby("_dominant_matrix_cat"):
+        if len(grp) < 3:
+            continue
+        pts = grp[["NMDS1", "NMDS2"]].values
+        try:
+            hull = ConvexHull(pts)
+        except Exception:
+            continue
+        hull_idx = list(hull.vertices) + [hull.vertices[0]]
+        hulls.append((group_name, pts[hull_idx, 0], pts[hull_idx, 1]))
+    return {"points": points, "hulls": hulls}
+
+
+def warm_start_coords(species_list, previous, dist):
+    """Initial NMDS coordinates from the previous fit, or None.
+
+    Species from the previous fit keep their coordinates; new ones start on
+    their most similar previously placed species. Needs at least half of the
+    species to overlap.
+    """
+    if not previous:
+        return None
+    placed = np.array([sp in previous for sp in species_list])
+    if placed.sum() < max(3, len(species_list) / 2):
+        return None
+    init = np.zeros((len(species_list), 2))
+    init[placed] = [previous[sp] for sp, ok in zip(species_list, placed) if ok]
+    placed_idx = np.flatnonzero(placed)
+    for i in np.flatnonzero(~placed):
+        nearest = placed_idx[np.argmin(dist[i, placed_idx])]
+        init[i] = init[nearest] + 1e-3 * (i % 7 - 3)
+    return init
+
+
+def fit_nmds(dist, mode="Accurate", init=None):
+    """Non-metric MDS of a precomputed distance matrix."""
+    params = NMDS_MODES[mode]
+    if init is None and mode == "Fast":
+        init = pcoa_coords(dist)
     mds = MDS(
         n_components=2,
         metric=False,
         dissimilarity="precomputed",
-        n_init=10,
-        max_iter=500,
+        n_init=1 if init is not None else params["n_init"],
+        max_iter=params["max_iter"],
+        eps=params["eps"],
+        random_state=42,
+    )
+    return mds.fit_transform(dist, init=init)
+
+
+def fit_pcoa(dist, mode="Accurate", init=None):
+    return pcoa_coords(dist)
+
+
+def fit_tsne(dist, mode="Accurate", init=None):
+    """t-SNE of a precomputed distance matrix, started from the PCoA layout."""
+    if init is None:
+        init = pcoa_coords(dist)
+        init = init / max(init[:, 0].std(), 1e-12) * 1e-4
+    tsne = TSNE(
+        n_components=2,
+        metric="precomputed",
+        init=init,
+        perplexity=min(30.0, (len(dist) - 1) / 3),
+        max_iter=TSNE_MODES[mode]["max_iter"],
         random_state=42,
     )
-    coords = mds.fit_transform(dist)
-    stress = mds.stress_
-    return coords, stress
+    return tsne.fit_transform(dist)
+
+
+ORDINATION_METHODS = {"NMDS": fit_nmds, "PCoA": fit_pcoa, "t-SNE": fit_tsne}
+
+
+def ordination_stress(dist, coords):
+    """Kruskal's stress-1 of a layout against the rank order of the distances.
+
+    Computed the same way for every method so the fits can be compared.
+    """
+    target = squareform(dist, checks=False)
+    fitted = pdist(coords)
+    disparities = IsotonicRegression().fit_transform(target, fitted)
+    return float(np.sqrt(((fitted - disparities) ** 2).sum() / max((fitted ** 2).sum(), 1e-12)))
+
+
+def fit_ordination(dist, method="NMDS", mode="Accurate", init=None):
+    """Fit one ordination method; returns (coords, stress, seconds)."""
+    started = time.perf_counter()
+    coords = ORDINATION_METHODS[method](dist, mode, init)
+    seconds = time.perf_counter() - started
+    return coords, ordination_stress(dist, coords), seconds
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def compute_ordination(feature_matrix, species_list, method="NMDS", mode="Accurate", init=None):
+    dist = braycurtis_distances(feature_digest(feature_matrix), feature_matrix)
+    return fit_ordination(dist, method, mode, init)
 
 
 @st.cache_data(ttl=86400)
@@ -595,6 +871,57 @@ def database_cache_signature(db_path):
     return str(db_path), stat.st_mtime_ns, stat.st_size
 
 
+METADATA_FILES = ("UK_Birds_Generalized_Status.xlsx", "species_diet.json")
+
+
+def metadata_signature():
+    """Modification times of the status spreadsheet and the diet map.
+
+    Saving a species' status or diet changes this, so stores keyed on it are
+    rebuilt with the new labels.
+    """
+    return tuple(
+        pathlib.Path(name).stat().st_mtime_ns if pathlib.Path(name).exists() else None
+        for name in METADATA_FILES
+    )
+
+
+# Detections whose coordinates agree to this many decimal places (about
+# 100 m) come from the same recorder.
+STATION_COORD_DECIMALS = 3
+ALL_STATIONS = "All stations"
+
+
+def station_labels(lat, lon):
+    """Station label for each detection, from its rounded coordinates."""
+    coords = pd.DataFrame({
+        "lat": lat.round(STATION_COORD_DECIMALS).to_numpy(),
+        "lon": lon.round(STATION_COORD_DECIMALS).to_numpy(),
+    })
+    keys = coords.drop_duplicates().copy()
+    keys["Station"] = [
+        f"{la:.{STATION_COORD_DECIMALS}f}, {lo:.{STATION_COORD_DECIMALS}f}"
+        if pd.notna(la) and pd.notna(lo) else "Unknown location"
+        for la, lo in zip(keys["lat"], keys["lon"])
+    ]
+    return coords.merge(keys, on=["lat", "lon"], how="left")["Station"].to_numpy()
+
+
+def local_to_utc(ts: pd.Series) -> pd.Series:
+    """Convert naive local (Europe/London) timestamps to naive UTC.
+
+    At the autumn clock change the repeated hour is read as BST (the first
+    occurrence); times skipped in spring are moved forward an hour, so 01:30
+    on that day becomes 01:30 UTC.
+    """
+    utc_ts = ts.dt.tz_localize(
+        "Europe/London",
+        ambiguous=np.ones(len(ts), dtype=bool),
+        nonexistent=pd.Timedelta(hours=1),
+    )
+    return utc_ts.dt.tz_convert("UTC").dt.tz_localize(None)
+
+
 @st.cache_data(max_entries=2)
 def load_data(db_path, db_mtime_ns, db_size):
     # The mtime and size arguments make Streamlit reload when cron updates the DB.
@@ -603,9 +930,15 @@ def load_data(db_path, db_mtime_ns, db_size):
     conn.close()
 
     df["timestamp"] = pd.to_datetime(df["Date"] + " " + df["Time"], errors="coerce")
+    df["timestamp_utc"] = local_to_utc(df["timestamp"])
+    # Confidence-weighted mode counts each detection by its confidence
+    df["weight"] = df["Confidence"].clip(0, 1)
     df["hour"]  = df["timestamp"].dt.hour
     df["week"]  = df["timestamp"].dt.isocalendar().week.astype(int)
     df["month"] = df["timestamp"].dt.month.astype(int)
+    df["time_bucket"] = time_buckets(df["hour"])
+    df["season"] = seasons(df["month"])
+    df["Station"] = station_labels(df["Lat"], df["Lon"])
 
     meta = pd.read_excel("UK_Birds_Generalized_Status.xlsx")
     meta = meta.rename(columns={
@@ -622,6 +955,532 @@ def load_data(db_path, db_mtime_ns, db_size):
 df = load_data(*database_cache_signature(DB_PATH))
 
 
+@st.cache_data(max_entries=2)
+def station_table(_data, db_signature):
+    """One row per recording station, busiest first."""
+    return (
+        _data.groupby("Station")
+        .agg(Lat=("Lat", "median"), Lon=("Lon", "median"), Detections=("Station", "size"))
+        .reset_index()
+        .sort_values("Detections", ascending=False, kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+# The Minimum Confidence slider snaps to these steps (plus the lowest
+# confidence in the data) so count aggregates can be precomputed per step.
+CONFIDENCE_LADDER = (0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95)
+
+
+def confidence_rungs(min_confidence, max_confidence):
+    """Slider steps: the data minimum, then every ladder step within range."""
+    steps = [step for step in CONFIDENCE_LADDER if min_confidence < step <= max_confidence]
+    return [float(min_confidence)] + steps
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def confidence_aggregate_table(_data, generation, rungs):
+    """Detections and confidence weights per rung, day, hour, species and status.
+
+    A row's rung is the highest slider step its detections reach, so the
+    table for a threshold is every row with rung >= that step's index.
+    Detections without a confidence never pass the slider and are left out.
+    """
+    data = _data.dropna(subset=["timestamp", "Confidence"])
+    agg = (
+        data.assign(
+            rung=np.searchsorted(np.asarray(rungs), data["Confidence"].to_numpy(), side="right") - 1,
+            date=data["timestamp"].dt.date,
+            year=data["timestamp"].dt.year,
+        )
+        .groupby(["rung", "date", "year", "month", "week", "hour", "Com_Name", "UK_Status"], observed=True)
+        .agg(detections=("weight", "size"), weight=("weight", "sum"))
+        .reset_index()
+    )
+    agg["season"] = seasons(agg["month"])
+    return agg
+
+
+def filter_aggregate_table(agg, rung=None, species=(), statuses=(), start_date=None, end_date=None,
+                           years=(), season="All", month=None, exclude_review=False):
+    """Apply the sidebar filters to a confidence_aggregate_table.
+
+    Also used for the confidence histogram keys, which have no rung column;
+    pass rung=None there.
+    """
+    mask = np.ones(len(agg), dtype=bool)
+    if rung is not None:
+        mask &= agg["rung"].to_numpy() >= rung
+    if species:
+        mask &= agg["Com_Name"].isin(species).to_numpy()
+    if statuses:
+        mask &= agg["UK_Status"].isin(statuses).to_numpy()
+    if start_date is not None:
+        mask &= (agg["date"] >= start_date).to_numpy()
+    if end_date is not None:
+        mask &= (agg["date"] <= end_date).to_numpy()
+    if years:
+        mask &= agg["year"].isin(years).to_numpy()
+    if season != "All":
+        mask &= (agg["season"] == season).to_numpy()
+    if month is not None:
+        mask &= (agg["month"] == month).to_numpy()
+    if exclude_review:
+        mask &= ~agg["UK_Status"].isin(["Review Recording", "False Positive"]).to_numpy()
+    return agg[mask]
+
+
+# Confidence histograms per species per day: 100 bins of 0.01, left-closed,
+# so ladder thresholds fall on bin edges.
+CONFIDENCE_BINS = 100
+
+
+def confidence_bins(confidence):
+    """Histogram bin of each confidence value."""
+    return np.clip(np.floor(confidence * CONFIDENCE_BINS + 1e-9).astype(int), 0, CONFIDENCE_BINS - 1)
+
+
+def daily_bin_checksums(days, detections, bin_totals):
+    """Detections and summed bin indices per day, for checking stored histograms."""
+    return (
+        pd.DataFrame({"day": days.astype(np.int64), "n": detections, "bins": bin_totals})
+        .astype(np.int64)
+        .groupby("day").sum()
+    )
+
+
+def build_confidence_histograms(data):
+    """Histogram rows for one block of detections.
+
+    Returns the keys (date, year, month, season, Com_Name, UK_Status; one row
+    per species per day) with matching detection counts and confidence sums
+    per bin.
+    """
+    data = data.dropna(subset=["timestamp", "Confidence"])
+    date = data["timestamp"].dt.date
+    groups = data.groupby([date.rename("date"), "Com_Name", "UK_Status"], dropna=False, sort=True)
+    codes = groups.ngroup().to_numpy()
+    n_keys = groups.ngroups
+    keys = groups.size().reset_index()[["date", "Com_Name", "UK_Status"]]
+    keys["year"] = pd.to_datetime(keys["date"]).dt.year
+    keys["month"] = pd.to_datetime(keys["date"]).dt.month
+    keys["season"] = seasons(keys["month"])
+
+    confidence = data["Confidence"].to_numpy(dtype=float)
+    bins = confidence_bins(confidence)
+    flat = codes * CONFIDENCE_BINS + bins
+    size = n_keys * CONFIDENCE_BINS
+    return {
+        "keys": keys,
+        "counts": np.bincount(flat, minlength=size).reshape(n_keys, CONFIDENCE_BINS).astype(np.int32),
+        "sums": np.bincount(flat, weights=confidence, minlength=size).reshape(n_keys, CONFIDENCE_BINS).astype(np.float32),
+    }
+
+
+@st.cache_resource
+def confidence_histogram_store():
+    return {"lock": threading.Lock(), "entries": {}}
+
+
+def confidence_histograms(data, db_signature, meta_signature, station):
+    """Confidence histograms for a station, kept up to date incrementally.
+
+    When the database changes but the detections before the last stored day
+    still match the stored histograms (the usual append-only case), only
+    that day onwards is re-binned and appended; otherwise the histograms are
+    rebuilt. The match is checked per day on the detection count and the
+    sum of bin indices, so a rewrite that keeps both for every older day
+    goes unnoticed. A change in the species metadata always rebuilds them,
+    since the stored keys carry each species' UK status.
+    """
+    data = data.dropna(subset=["timestamp", "Confidence"])
+    store = confidence_histogram_store()
+    with store["lock"]:
+        entry = store["entries"].get(station)
+        if entry is not None and entry["signature"] == (db_signature, meta_signature):
+            return entry
+
+        fresh = None
+        if entry is not None and entry["signature"][1] == meta_signature and len(entry["keys"]):
+            last_day = pd.Timestamp(entry["last_date"])
+            older = (data["timestamp"] < last_day).to_numpy()
+            kept = (entry["keys"]["date"] < entry["last_date"]).to_numpy()
+            current = daily_bin_checksums(
+                data.loc[older, "timestamp"].to_numpy().astype("datetime64[D]"),
+                1,
+                confidence_bins(data.loc[older, "Confidence"].to_numpy(dtype=float)),
+            )
+            kept_counts = entry["counts"][kept]
+            stored = daily_bin_checksums(
+                entry["keys"].loc[kept, "date"].to_numpy().astype("datetime64[D]"),
+                kept_counts.sum(axis=1),
+                kept_counts @ np.arange(CONFIDENCE_BINS),
+            )
+            if current.equals(stored):
+                added = build_confidence_histograms(data[~older])
+                fresh = {
+                    "keys": pd.concat([entry["keys"][kept], added["keys"]], ignore_index=True),
+                    "counts": np.concatenate([entry["counts"][kept], added["counts"]]),
+                    "sums": np.concatenate([entry["sums"][kept], added["sums"]]),
+                }
+        if fresh is None:
+            fresh = build_confidence_histograms(data)
+
+        fresh["signature"] = (db_signature, meta_signature)
+        fresh["last_date"] = fresh["keys"]["date"].max() if len(fresh["keys"]) else None
+        store["entries"][station] = fresh
+        return fresh
+
+
+def confidence_bin(value):
+    """Index of the first bin at or above a threshold on the 0.01 grid."""
+    return int(np.clip(np.floor(value * CONFIDENCE_BINS + 1e-9), 0, CONFIDENCE_BINS))
+
+
+def histogram_quantile(counts, q):
+    """Quantile per histogram row, interpolated linearly within the bin."""
+    counts = np.asarray(counts, dtype=float)
+    totals = counts.sum(axis=1)
+    cumulative = counts.cumsum(axis=1)
+    target = q * totals
+    idx = np.minimum((cumulative < target[:, None]).sum(axis=1), counts.shape[1] - 1)
+    rows = np.arange(len(counts))
+    before = cumulative[rows, idx] - counts[rows, idx]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        within = np.where(counts[rows, idx] > 0, (target - before) / counts[rows, idx], 0.5)
+    result = (idx + within) / CONFIDENCE_BINS
+    return np.where(totals > 0, result, np.nan)
+
+
+DIVERSITY_RESOLUTIONS = ["Month", "Week", "Day"]
+
+
+def period_labels(dates, resolution):
+    """Period label for each date: 2024-05, 2024-W19 or 2024-05-13.
+
+    Labels are worked out once per distinct date and then broadcast.
+    """
+    unique_dates, inverse = np.unique(np.asarray(dates), return_inverse=True)
+    days = pd.DatetimeIndex(pd.to_datetime(unique_dates))
+    if resolution == "Month":
+        labels = days.strftime("%Y-%m")
+    elif resolution == "Week":
+        iso = days.isocalendar()
+        labels = iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)
+    else:
+        labels = days.strftime("%Y-%m-%d")
+    return np.asarray(labels, dtype=object)[inverse]
+
+
+def period_species_counts(data, periods, weighted=False):
+    """Period × species count table from a single groupby."""
+    counts = tally(data.assign(period=periods), ["period", "Com_Name"], weighted)
+    return counts.unstack(fill_value=0).sort_index()
+
+
+def diversity_indices(counts):
+    """Shannon H', Simpson 1-D and richness for every row of a period × species table."""
+    values = counts.to_numpy(dtype=float)
+    totals = values.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        proportions = np.where(totals > 0, values / totals, 0.0)
+        log_p = np.where(proportions > 0, np.log(proportions), 0.0)
+    has_data = totals[:, 0] > 0
+    return pd.DataFrame({
+        "Shannon_H": np.where(has_data, -(proportions * log_p).sum(axis=1), 0.0),
+        "Simpson_1D": np.where(has_data, 1 - (proportions ** 2).sum(axis=1), 0.0),
+        "Unique_Species": (values > 0).sum(axis=1),
+    }, index=counts.index)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def diversity_table(_data, view_key, resolution, weighted):
+    """Diversity indices per period for the filtered view identified by `view_key`."""
+    if len(_data) == 0:
+        return pd.DataFrame(columns=["Period", "Shannon_H", "Simpson_1D", "Unique_Species"])
+    counts = period_species_counts(_data, period_labels(_data["date"], resolution), weighted)
+    return diversity_indices(counts).rename_axis("Period").reset_index()
+
+
+# Hill numbers and rarefaction. Periods need this many detections to be
+# rarefied; the rarefaction depth is the smallest such period.
+RAREFACTION_MIN_DETECTIONS = 20
+HILL_BOOTSTRAP_SAMPLES = 200
+HILL_BOOTSTRAP_CHUNK = 64
+
+
+def hill_numbers(counts):
+    """Hill numbers q=0, 1, 2 (richness, exp Shannon, inverse Simpson) per row of counts.
+
+    `counts` may carry leading axes (bootstrap replicates); species are on the last axis.
+    """
+    counts = np.asarray(counts, dtype=float)
+    totals = counts.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        proportions = np.where(totals > 0, counts / totals, 0.0)
+        log_p = np.where(proportions > 0, np.log(proportions), 0.0)
+        q0 = (counts > 0).sum(axis=-1).astype(float)
+        q1 = np.exp(-(proportions * log_p).sum(axis=-1))
+        q2 = 1.0 / (proportions ** 2).sum(axis=-1)
+    empty = totals[..., 0] == 0
+    return np.where(empty, 0.0, q0), np.where(empty, 0.0, q1), np.where(empty, 0.0, q2)
+
+
+def rarefied_richness(counts, depth):
+    """Expected species in a random subsample of `depth` detections (Hurlbert), per row.
+
+    Rows with fewer than `depth` detections are NaN.
+    """
+    counts = np.asarray(counts, dtype=float)
+    totals = counts.sum(axis=1, keepdims=True)
+    others = totals - counts
+    # P(species absent from the subsample) = C(N - Ni, m) / C(N, m), in log space
+    with np.errstate(invalid="ignore"):
+        log_absent = (
+            gammaln(others + 1) - gammaln(others - depth + 1)
+            - gammaln(totals + 1) + gammaln(totals - depth + 1)
+        )
+    absent = np.where(others >= depth, np.exp(log_absent), 0.0)
+    expected = np.where(counts > 0, 1.0 - absent, 0.0).sum(axis=1)
+    return np.where(totals[:, 0] >= depth, expected, np.nan)
+
+
+def bootstrap_hill_intervals(counts, n_boot=HILL_BOOTSTRAP_SAMPLES, seed=0, max_workers=4):
+    """2.5% and 97.5% bootstrap bounds of the Hill numbers for each row of counts.
+
+    Each period is resampled multinomially from its own species proportions;
+    chunks of periods are drawn in one vectorised call and spread across
+    threads.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    totals = counts.sum(axis=1)
+    bounds = np.zeros((3, 2, len(counts)))
+    rows = np.flatnonzero(totals > 0)
+    chunks = [rows[i:i + HILL_BOOTSTRAP_CHUNK] for i in range(0, len(rows), HILL_BOOTSTRAP_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(max(len(chunks), 1))
+
+    def resample(job):
+        chunk, chunk_seed = job
+        rng = np.random.default_rng(chunk_seed)
+        pvals = counts[chunk] / totals[chunk, None]
+        samples = rng.multinomial(totals[chunk], pvals, size=(n_boot, len(chunk)))
+        return chunk, [np.percentile(q, [2.5, 97.5], axis=0) for q in hill_numbers(samples)]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for chunk, quantiles in pool.map(resample, zip(chunks, seeds)):
+            for q, (lo, hi) in enumerate(quantiles):
+                bounds[q, 0, chunk] = lo
+                bounds[q, 1, chunk] = hi
+    return bounds
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def hill_diversity_table(_data, view_key, resolution):
+    """Hill numbers with bootstrap intervals and rarefied richness per period.
+
+    Uses raw detection counts; resampling and rarefaction need whole detections.
+    """
+    columns = ["Period", "Detections", "Rarefied"] + [
+        f"q{q}{suffix}" for q in range(3) for suffix in ("", "_lo", "_hi")
+    ]
+    if len(_data) == 0:
+        return pd.DataFrame(columns=columns), 0
+    counts = period_species_counts(_data, period_labels(_data["date"], resolution))
+    values = counts.to_numpy()
+    totals = values.sum(axis=1)
+    eligible = totals[totals >= RAREFACTION_MIN_DETECTIONS]
+    depth = int(eligible.min()) if len(eligible) else 0
+
+    table = pd.DataFrame({"Period": counts.index, "Detections": totals})
+    table["Rarefied"] = rarefied_richness(values, depth) if depth else np.nan
+    bounds = bootstrap_hill_intervals(values)
+    for q, estimate in enumerate(hill_numbers(values)):
+        table[f"q{q}"] = estimate
+        table[f"q{q}_lo"] = bounds[q, 0]
+        table[f"q{q}_hi"] = bounds[q, 1]
+    return table[columns], depth
+
+
+COOCCURRENCE_NORMALISATIONS = ["Min count", "Jaccard", "PMI"]
+
+
+@st.cache_data(max_entries=6, show_spinner=False)
+def cooccurrence_engine(_data, view_key, unit, weighted):
+    """Sparse unit × species presence and the full species × species co-occurrence.
+
+    Units are calendar days or clock hours. In weighted mode a species'
+    presence in a unit is its best confidence there. Species are ordered
+    busiest first, so the top N is a leading slice.
+    """
+    data = _data.dropna(subset=["timestamp", "Com_Name"])
+    resolution = "datetime64[D]" if unit == "Day" else "datetime64[h]"
+    unit_codes, unit_values = pd.factorize(
+        data["timestamp"].to_numpy().astype(resolution).astype(np.int64), sort=True,
+    )
+    species_codes, species = pd.factorize(data["Com_Name"], sort=True)
+    if weighted:
+        best = data["weight"].groupby([unit_codes, species_codes]).max()
+        rows = best.index.get_level_values(0).to_numpy()
+        cols = best.index.get_level_values(1).to_numpy()
+        values = best.to_numpy(dtype=float)
+        totals = np.bincount(species_codes, weights=data["weight"].to_numpy(dtype=float), minlength=len(species))
+    else:
+        pairs = np.unique(unit_codes.astype(np.int64) * len(species) + species_codes)
+        rows, cols = np.divmod(pairs, len(species))
+        values = np.ones(len(pairs))
+        totals = np.bincount(species_codes, minlength=len(species))
+
+    order = np.argsort(-totals, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    presence = sparse.csr_matrix((values, (rows, rank[cols])), shape=(len(unit_values), len(species)))
+    return {
+        "species": np.asarray(species, dtype=object)[order],
+        "units": np.asarray(unit_values),
+        "presence": presence,
+        "co": (presence.T @ presence).toarray(),
+        "occurrences": np.asarray(presence.sum(axis=0)).ravel(),
+    }
+
+
+def cooccurrence_scores(engine, method, top_n=None):
+    """Normalised co-occurrence for the top_n busiest species (all when None)."""
+    k = len(engine["species"]) if top_n is None else min(top_n, len(engine["species"]))
+    co = engine["co"][:k, :k]
+    occurrences = engine["occurrences"][:k]
+    row, col = occurrences[:, None], occurrences[None, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if method == "Jaccard":
+            union = row + col - co
+            scores = np.where(union > 0, co / union, 0.0)
+        elif method == "PMI":
+            scores = np.where(co > 0, np.log(co * len(engine["units"]) / (row * col)), np.nan)
+        else:
+            scores = co / np.maximum(np.minimum(row, col), 1e-9)
+            scores[np.minimum(row, col) == 0] = 0.0
+    np.fill_diagonal(scores, np.nan if method == "PMI" else 0.0)
+    return scores
+
+
+COOCCURRENCE_PERMUTATIONS = 199
+# Cells (units × species × permutations) per batched matrix product
+COOCCURRENCE_BATCH_CELLS = 2_000_000
+
+
+def cooccurrence_strata(units, unit):
+    """Every calendar unit in the strata the observed units fall in.
+
+    Strata are days for hour units and months for day units, within the
+    recorded span. Empty units are included, so rotating a species within
+    its stratum keeps it as likely to land in a quiet hour as in a busy one.
+    Returns the grid row of each observed unit, and each grid unit's stratum
+    start, size, position and stratum code.
+    """
+    if unit == "Day":
+        months = np.unique(units.astype("datetime64[D]").astype("datetime64[M]"))
+        first = months.astype("datetime64[D]").astype(np.int64)
+        last = (months + 1).astype("datetime64[D]").astype(np.int64)
+    else:
+        first = np.unique(units // 24) * 24
+        last = first + 24
+    # Strata at the ends are cut to the recorded span
+    if len(units):
+        first = np.maximum(first, units.min())
+        last = np.minimum(last, units.max() + 1)
+    lengths = last - first
+    codes = np.repeat(np.arange(len(first)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    positions = np.arange(len(codes)) - starts[codes]
+    grid = first[codes] + positions
+    return np.searchsorted(grid, units), starts[codes], lengths[codes], positions, codes
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def cooccurrence_null(_engine, view_key, unit, weighted, top_n,
+                      n_perm=COOCCURRENCE_PERMUTATIONS, seed=0, max_workers=4):
+    """Permutation test of every pair among the top_n species.
+
+    Each permutation rotates every species' presence by a random offset
+    within each stratum, empty units included (see cooccurrence_strata),
+    which keeps how often it was present per day or month, then recounts
+    all pairs with one batched matrix product. Returns the null mean,
+    z-scores and two-sided p-values.
+    """
+    k = min(top_n, len(_engine["species"]))
+    observed = _engine["co"][:k, :k]
+    grid_rows, starts, sizes, positions, strata = cooccurrence_strata(_engine["units"], unit)
+    presence = np.zeros((len(strata), k), dtype=np.float32)
+    presence[grid_rows] = _engine["presence"][:, :k].toarray()
+    n_strata = strata.max() + 1 if len(strata) else 0
+    columns = np.arange(k)
+
+    batch = max(1, min(n_perm, COOCCURRENCE_BATCH_CELLS // max(presence.size, 1)))
+    batches = [min(batch, n_perm - done) for done in range(0, n_perm, batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+
+    def run_batch(job):
+        size, batch_seed = job
+        rng = np.random.default_rng(batch_seed)
+        offsets = rng.random((size, n_strata, k))
+        shift = np.floor(offsets[:, strata, :] * sizes[None, :, None]).astype(np.int64)
+        rows = starts[None, :, None] + (positions[None, :, None] + shift) % sizes[None, :, None]
+        shuffled = presence[rows, columns]
+        return shuffled.transpose(0, 2, 1) @ shuffled
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        null = np.concatenate(list(pool.map(run_batch, zip(batches, seeds))))
+
+    mean = null.mean(axis=0)
+    sd = null.std(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = np.where(sd > 0, (observed - mean) / sd, np.nan)
+    extreme = (np.abs(null - mean) >= np.abs(observed - mean) - 1e-9).sum(axis=0)
+    p = (extreme + 1) / (n_perm + 1)
+    np.fill_diagonal(z, np.nan)
+    np.fill_diagonal(p, np.nan)
+    return {"expected": mean, "z": z, "p": p}
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def species_time_index(_data, view_key):
+    """Sorted UTC detection times (seconds) per species, busiest species first.
+
+    UTC keeps lags right across the clock changes.
+    """
+    data = _data.dropna(subset=["timestamp_utc", "Com_Name"])
+    seconds = data["timestamp_utc"].to_numpy().astype("datetime64[s]").astype(np.int64)
+    codes, species = pd.factorize(data["Com_Name"], sort=True)
+    order = np.lexsort((seconds, codes))
+    sorted_seconds = seconds[order]
+    bounds = np.searchsorted(codes[order], np.arange(len(species) + 1))
+    times = [sorted_seconds[bounds[i]:bounds[i + 1]] for i in range(len(species))]
+    busiest = np.argsort(-np.diff(bounds), kind="stable")
+    return {
+        "species": np.asarray(species, dtype=object)[busiest],
+        "times": [times[i] for i in busiest],
+    }
+
+
+def lagged_cooccurrence(time_index, lag_minutes, top_n):
+    """How many detections of species A (rows) are followed by species B (columns)
+    within `lag_minutes`, for the top_n busiest species.
+
+    For every A detection a binary search in B's sorted times finds the first
+    later B detection; the pair counts when it falls inside the lag.
+    """
+    times = time_index["times"][:top_n]
+    lag = int(lag_minutes * 60)
+    followed = np.zeros((len(times), len(times)), dtype=np.int64)
+    for a, first in enumerate(times):
+        for b, then in enumerate(times):
+            if a == b or len(first) == 0 or len(then) == 0:
+                continue
+            nxt = np.searchsorted(then, first, side="right")
+            in_range = nxt < len(then)
+            followed[a, b] = (then[nxt[in_range]] - first[in_range] <= lag).sum()
+    return followed, np.array([len(t) for t in times])
+
+
 def load_diet_map():
     try:
         with open("species_diet.json") as f:
@@ -661,13 +1520,11 @@ def fetch_weather(lat: float, lon: float, start_date: str, end_date: str):
         hourly["date"] = hourly["datetime"].dt.date
         hourly["hour"] = hourly["datetime"].dt.hour
 
-        # Parse sunrise/sunset as Europe/London aware, then convert to UTC
-        _tz_london = ZoneInfo("Europe/London")
-        _tz_utc = ZoneInfo("UTC")
-        sunrise_local = pd.to_datetime(data["daily"]["sunrise"])
-        sunset_local = pd.to_datetime(data["daily"]["sunset"])
-        sunrise_utc = sunrise_local.map(lambda t: t.replace(tzinfo=_tz_london).astimezone(_tz_utc).replace(tzinfo=None))
-        sunset_utc = sunset_local.map(lambda t: t.replace(tzinfo=_tz_london).astimezone(_tz_utc).replace(tzinfo=None))
+        # Parse sunrise/sunset as Europe/London local times, then convert to UTC
+        sunrise_local = pd.DatetimeIndex(pd.to_datetime(data["daily"]["sunrise"]))
+        sunset_local = pd.DatetimeIndex(pd.to_datetime(data["daily"]["sunset"]))
+        sunrise_utc = sunrise_local.tz_localize("Europe/London").tz_convert("UTC").tz_localize(None)
+        sunset_utc = sunset_local.tz_localize("Europe/London").tz_convert("UTC").tz_localize(None)
 
         daily = pd.DataFrame({
             "date": pd.to_datetime(data["daily"]["time"]).date,
@@ -685,6 +1542,36 @@ def fetch_weather(lat: float, lon: float, start_date: str, end_date: str):
         return None, None
 
 
+def map_with_script_ctx(fn, items, max_workers=4):
+    """Map fn over items on worker threads that share the script run context."""
+    ctx = get_script_run_ctx()
+
+    def run(item):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(item)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        return list(executor.map(run, items))
+
+
+def start_weather_fetch(lat, lon, start_date, end_date):
+    """Call fetch_weather on a worker thread and return its future.
+
+    The worker shares the script run context so the cache behaves as it
+    does on the main thread.
+    """
+    ctx = get_script_run_ctx()
+
+    def run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fetch_weather(lat, lon, start_date, end_date)
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(run)
+    executor.shutdown(wait=False)
+    return future
+
+
 @st.cache_data(ttl=3600)
 def fetch_inat_nearby(lat, lon, radius_km=25, days_back=30, per_page=200):
     """Fetch recent bird observations from iNaturalist near a location."""
@@ -710,18 +1597,70 @@ def fetch_inat_nearby(lat, lon, radius_km=25, days_back=30, per_page=200):
         return None
 
 
-_TZ_LONDON = ZoneInfo("Europe/London")
-_TZ_UTC = ZoneInfo("UTC")
+def solar_events_utc(lat, lon, day_ordinals):
+    """Sunrise and sunset for each day (days since 1970-01-01) as UTC datetime64.
 
-
-def to_utc_hour(ts: pd.Series) -> pd.Series:
-    """Convert naive local (Europe/London) detection timestamps to UTC decimal hours."""
-    utc_ts = ts.apply(lambda t: t.replace(tzinfo=_TZ_LONDON).astimezone(_TZ_UTC) if pd.notna(t) else t)
-    return utc_ts.dt.hour + utc_ts.dt.minute / 60.0
+    Uses the NOAA sunrise equation, accurate to about a minute; days with no
+    sunrise or sunset (polar day or night) come back as NaT.
+    """
+    n = np.asarray(day_ordinals, dtype=float) - 10957  # days since 2000-01-01
+    j_star = n - lon / 360.0
+    mean_anomaly = np.radians((357.5291 + 0.98560028 * j_star) % 360)
+    centre = (
+        1.9148 * np.sin(mean_anomaly)
+        + 0.0200 * np.sin(2 * mean_anomaly)
+        + 0.0003 * np.sin(3 * mean_anomaly)
+    )
+    ecliptic_lon = np.radians((np.degrees(mean_anomaly) + centre + 180 + 102.9372) % 360)
+    transit = j_star + 0.0053 * np.sin(mean_anomaly) - 0.0069 * np.sin(2 * ecliptic_lon)
+    sin_decl = np.sin(ecliptic_lon) * np.sin(np.radians(23.4397))
+    cos_decl = np.cos(np.arcsin(sin_decl))
+    phi = np.radians(lat)
+    cos_hour_angle = (np.sin(np.radians(-0.833)) - np.sin(phi) * sin_decl) / (np.cos(phi) * cos_decl)
+    with np.errstate(invalid="ignore"):
+        half_day = np.degrees(np.arccos(cos_hour_angle)) / 360.0
+
+    epoch_2000 = np.datetime64("2000-01-01T12:00", "s")
+
+    def to_datetime(days):
+        seconds = np.round(days * 86400)
+        return np.where(
+            np.isnan(seconds),
+            np.datetime64("NaT"),
+            epoch_2000 + np.nan_to_num(seconds).astype("timedelta64[s]"),
+        ).astype("datetime64[s]")
+
+    return to_datetime(transit - half_day), to_datetime(transit + half_day)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def sun_table(lat, lon, start_date, end_date):
+    """Offline sunrise and sunset for every date in the range.
+
+    sunrise_utc/sunset_utc are naive UTC, sunrise/sunset naive Europe/London,
+    matching the detection timestamps.
+    """
+    dates = pd.date_range(start_date, end_date, freq="D")
+    ordinals = dates.to_numpy().astype("datetime64[D]").astype(np.int64)
+    sunrise_utc, sunset_utc = solar_events_utc(lat, lon, ordinals)
+    sunrise_utc = pd.DatetimeIndex(sunrise_utc)
+    sunset_utc = pd.DatetimeIndex(sunset_utc)
+    return pd.DataFrame({
+        "date": dates.date,
+        "sunrise_utc": sunrise_utc,
+        "sunset_utc": sunset_utc,
+        "sunrise": sunrise_utc.tz_localize("UTC").tz_convert("Europe/London").tz_localize(None),
+        "sunset": sunset_utc.tz_localize("UTC").tz_convert("Europe/London").tz_localize(None),
+    })
 
 
 DAILY_PERIOD_OPTIONS = ["Day", "Last 7 days", "Last 30 days"]
 VISIBLE_HEADLINE_LIMIT = 10
+NEWS_CATEGORY_QUOTA = 3
+# Headline charts are drawn for the first few headlines; the rest wait for
+# their toggle. Computed chart series are kept per session up to the cap.
+NEWS_CHARTS_OPEN = 3
+NEWS_CHART_CACHE_SIZE = 64
 NEWS_CHART_HEIGHT = 200
 GARDEN_EVENTS_PATH = pathlib.Path("garden_events.json")
 
@@ -755,6 +1694,18 @@ def filter_date_window(data, start_date, end_date):
     ].copy()
 
 
+def tally(data, by, weighted=False):
+    """Detections per group, or the summed confidence weights in weighted mode.
+
+    Works on raw detections and on confidence_aggregate_table rows.
+    """
+    if weighted:
+        return data.groupby(by)["weight"].sum()
+    if "detections" in data.columns:
+        return data.groupby(by)["detections"].sum()
+    return data.groupby(by).size()
+
+
 @st.cache_data
 def load_garden_events():
     try:
@@ -813,16 +1764,6 @@ def period_noun(period_days):
     return f"{period_days}-day period"
 
 
-def news_season_from_month(month):
-    if month in (3, 4, 5):
-        return "Spring"
-    if month in (6, 7, 8):
-        return "Summer"
-    if month in (9, 10, 11):
-        return "Autumn"
-    return "Winter"
-
-
 def date_label(date_value):
     if pd.isna(date_value):
         return "unknown date"
@@ -838,70 +1779,268 @@ def doy_label(doy):
     return f"{ref.day} {ref.strftime('%b')}"
 
 
-def event_species_mask(data, event):
-    names = data["Com_Name"].fillna("").astype(str)
-    names_lower = names.str.lower()
-    mask = pd.Series(False, index=data.index)
+def month_bits(months):
+    """Bitmask with bit m set for each month number m."""
+    bits = 0
+    for month in months:
+        bits |= 1 << int(month)
+    return bits
 
+
+def event_matches_species(event, species):
+    species_lower = str(species).lower()
     exact_names = {str(s).lower() for s in event.get("species", [])}
-    if exact_names:
-        mask = mask | names_lower.isin(exact_names)
+    if species_lower in exact_names:
+        return True
+    return any(
+        str(term).strip().lower() in species_lower
+        for term in event.get("match_terms", [])
+        if str(term).strip()
+    )
+
 
-    for term in event.get("match_terms", []):
-        term = str(term).strip().lower()
-        if term:
-            mask = mask | names_lower.str.contains(term, regex=False)
+@st.cache_data(show_spinner=False)
+def compile_garden_events(events, species_names):
+    """Resolve each event's names and match terms against the known species.
+
+    Returns the events with their month bitmasks (0 means any month), the
+    species set each event matches and a species -> event ids index.
+    """
+    events = list(events)
+    event_species = []
+    species_events = {name: [] for name in species_names}
+    for event_id, event in enumerate(events):
+        matched = frozenset(name for name in species_names if event_matches_species(event, name))
+        event_species.append(matched)
+        for name in matched:
+            species_events[name].append(event_id)
+    return {
+        "events": events,
+        "month_bits": [month_bits(event.get("months", [])) for event in events],
+        "event_species": event_species,
+        "species_events": species_events,
+    }
 
-    return mask
 
+def event_species_mask(data, event_index, event_id):
+    return data["Com_Name"].isin(event_index["event_species"][event_id])
 
-def matching_events(species, events, trigger=None, months=None):
-    species_lower = str(species).lower()
+
+def matching_events(species, event_index, trigger=None, months=None):
+    if not event_index:
+        return []
+    event_ids = event_index["species_events"].get(species)
+    if event_ids is None:
+        event_ids = [
+            event_id for event_id, event in enumerate(event_index["events"])
+            if event_matches_species(event, species)
+        ]
+    query_bits = month_bits(months) if months is not None else None
     matched = []
-    for event in events:
+    for event_id in event_ids:
+        event = event_index["events"][event_id]
         if trigger is not None and event.get("trigger") != trigger:
             continue
-        event_months = set(event.get("months", []))
-        if months is not None and event_months and not event_months.intersection(months):
+        event_bits = event_index["month_bits"][event_id]
+        if query_bits is not None and event_bits and not event_bits & query_bits:
             continue
-
-        exact_names = {str(s).lower() for s in event.get("species", [])}
-        term_match = any(
-            str(term).strip().lower() in species_lower
-            for term in event.get("match_terms", [])
-            if str(term).strip()
-        )
-        if species_lower in exact_names or term_match:
-            matched.append(event)
+        matched.append(event)
     return matched
 
 
-def comparison_window(all_news, current_news, start_date, end_date, prefer_same_month=True):
-    if len(all_news) == 0:
-        return all_news.iloc[0:0].copy()
+# Seasonal baselines pool every other year's detections within this many days
+# either side of the selected period's day of year.
+BASELINE_WINDOW_DAYS = 15
+BASELINE_KEYS = ["days", "species", "species_sq", "hours", "conf_rows", "conf_sum", "low_conf"]
+
+
+def doy_index(date_value):
+    return date_value.timetuple().tm_yday - 1
+
+
+def prefix_sum(values):
+    """Cumulative sums along the first axis with a leading zero row."""
+    zero = np.zeros((1,) + values.shape[1:], dtype=values.dtype)
+    return np.concatenate([zero, np.cumsum(values, axis=0)])
+
+
+def circular_window_sum(cumulative, lo, hi):
+    """Sum day-of-year slots lo..hi (inclusive, may wrap) from a prefix sum."""
+    slots = cumulative.shape[0] - 1
+    if hi - lo + 1 >= slots:
+        return cumulative[slots]
+    lo %= slots
+    hi %= slots
+    if lo <= hi:
+        return cumulative[hi + 1] - cumulative[lo]
+    return cumulative[slots] - cumulative[lo] + cumulative[hi + 1]
+
+
+def baseline_sums(news_df, species):
+    """Per-day-of-year totals used by the baseline store and its period subtraction."""
+    doy = news_df["doy"].to_numpy() - 1
+    n_species = len(species)
+    names = news_df["Com_Name"].fillna("").astype(str).to_numpy()
+    codes = np.minimum(np.searchsorted(species, names), max(n_species - 1, 0))
+    named = news_df["Com_Name"].notna().to_numpy()
+    if n_species:
+        named &= species[codes] == names
+    else:
+        named[:] = False
+    codes = codes[named]
+    confidence = news_df["Confidence"].to_numpy(dtype=float)
+    has_conf = ~np.isnan(confidence)
+    day_doy = news_df.drop_duplicates("date")["doy"].to_numpy() - 1
+
+    # Squared species-by-day counts give the daily variance behind the
+    # negative-binomial anomaly scores.
+    days = news_df["timestamp"].to_numpy().astype("datetime64[D]").astype(np.int64)[named]
+    species_sq = np.zeros((366, n_species))
+    if len(days):
+        day_codes = days - days.min()
+        n_days = int(day_codes.max()) + 1
+        cube = np.bincount(day_codes * n_species + codes, minlength=n_days * n_species).reshape(n_days, n_species)
+        cube_doy = np.zeros(n_days, dtype=int)
+        cube_doy[day_codes] = doy[named]
+        np.add.at(species_sq, cube_doy, cube.astype(float) ** 2)
+
+    return {
+        "days": np.bincount(day_doy, minlength=366),
+        "species": np.bincount(doy[named] * n_species + codes, minlength=366 * n_species).reshape(366, n_species),
+        "species_sq": species_sq,
+        "hours": np.bincount(doy * 24 + news_df["hour"].to_numpy(), minlength=366 * 24).reshape(366, 24),
+        "conf_rows": np.bincount(doy[has_conf], minlength=366),
+        "conf_sum": np.bincount(doy[has_conf], weights=confidence[has_conf], minlength=366),
+        "low_conf": np.bincount(doy[has_conf & (confidence <= 0.70)], minlength=366),
+    }
 
-    period_days = (end_date - start_date).days + 1
-    not_current = ~((all_news["date"] >= start_date) & (all_news["date"] <= end_date))
-    comparison = all_news[not_current].copy()
 
-    if prefer_same_month and len(current_news):
-        months = set(current_news["month_num"].dropna().astype(int).unique().tolist())
-        same_month = comparison[comparison["month_num"].isin(months)].copy()
-        if same_month["date"].nunique() >= max(7, period_days):
-            return same_month
+def build_news_baselines(all_news):
+    """Day-of-year prefix sums over the full history.
 
-    return comparison
+    Any seasonal comparison window is two lookups per array, so expected
+    counts no longer rescan the history for every generator and chart.
+    """
+    if len(all_news):
+        species = np.array(sorted(all_news["Com_Name"].dropna().astype(str).unique()))
+    else:
+        species = np.array([], dtype=str)
+    sums = baseline_sums(all_news, species) if len(all_news) else None
+    baselines = {"species_names": species, "species_pos": {name: i for i, name in enumerate(species)}}
+    for key in BASELINE_KEYS:
+        if sums is None:
+            shape = (366, len(species)) if key in ["species", "species_sq"] else (366, 24) if key == "hours" else (366,)
+            baselines[key] = prefix_sum(np.zeros(shape))
+        else:
+            baselines[key] = prefix_sum(sums[key])
+
+    dawn = all_news[(all_news["hour"] >= 3) & (all_news["hour"] <= 10)] if len(all_news) else all_news
+    if len(dawn):
+        dawn_first = decimal_hour(dawn["timestamp"]).groupby(dawn["timestamp"].dt.normalize()).min()
+        baselines["dawn_ordinal"] = dawn_first.index.to_numpy().astype("datetime64[D]").astype(np.int64)
+        baselines["dawn_doy"] = dawn_first.index.dayofyear.to_numpy() - 1
+        baselines["dawn_first"] = dawn_first.to_numpy()
+    else:
+        baselines["dawn_ordinal"] = np.array([], dtype=np.int64)
+        baselines["dawn_doy"] = np.array([], dtype=int)
+        baselines["dawn_first"] = np.array([], dtype=float)
+    return baselines
+
+
+def baseline_comparison(baselines, current_news, start_date, end_date):
+    """Comparison totals for a period, excluding the period itself.
+
+    Same-season days from the pooled window are preferred; with too few of
+    them the whole history is used instead.
+    """
+    period_days = (end_date - start_date).days + 1
+    lo = doy_index(start_date) - BASELINE_WINDOW_DAYS
+    hi = doy_index(start_date) + period_days - 1 + BASELINE_WINDOW_DAYS
+    current = baseline_sums(current_news, baselines["species_names"]) if len(current_news) else None
+
+    def totals(select):
+        comp = {}
+        for key in BASELINE_KEYS:
+            comp[key] = select(baselines[key])
+            if current is not None:
+                comp[key] = comp[key] - current[key].sum(axis=0)
+        return comp
+
+    seasonal = totals(lambda cumulative: circular_window_sum(cumulative, lo, hi))
+    if seasonal["days"] >= max(7, period_days):
+        seasonal["window"] = (lo, hi) if hi - lo + 1 < 366 else None
+        return seasonal
+    comp = totals(lambda cumulative: cumulative[-1])
+    comp["window"] = None
+    return comp
+
+
+def baseline_first_dawn(baselines, comp, start_date, end_date):
+    """First 03:00-10:00 detection (decimal hour) on each comparison day."""
+    outside = (
+        (baselines["dawn_ordinal"] < day_ordinal(start_date)) |
+        (baselines["dawn_ordinal"] > day_ordinal(end_date))
+    )
+    if comp["window"] is not None:
+        lo, hi = comp["window"]
+        outside &= (baselines["dawn_doy"] - lo) % 366 <= hi - lo
+    return baselines["dawn_first"][outside]
 
 
-def expected_count_for_period(all_news, current_news, start_date, end_date, filter_mask=None):
+def expected_count_for_period(baselines, current_news, start_date, end_date, species=None, hours=None):
     period_days = (end_date - start_date).days + 1
-    comp = comparison_window(all_news, current_news, start_date, end_date)
-    if filter_mask is not None and len(comp):
-        comp = comp[filter_mask(comp)].copy()
-    comp_days = comp["date"].nunique()
-    if comp_days == 0:
+    comp = baseline_comparison(baselines, current_news, start_date, end_date)
+    if comp["days"] <= 0:
         return None
-    return (len(comp) / comp_days) * period_days
+    if species is not None:
+        pos = baselines["species_pos"].get(species)
+        count = comp["species"][pos] if pos is not None else 0
+    elif hours is not None:
+        count = comp["hours"][list(hours)].sum()
+    else:
+        count = comp["hours"].sum()
+    return (count / comp["days"]) * period_days
+
+
+# Species change headlines need a count this many standard deviations from
+# the seasonal expectation (drops are capped at zero, so need less), plus a
+# minimum ratio so long periods do not headline small but significant shifts.
+ANOMALY_SPIKE_Z = 3.0
+ANOMALY_DROP_Z = -2.5
+ANOMALY_SPIKE_RATIO = 1.5
+ANOMALY_DROP_RATIO = 0.6
+
+
+def score_species_anomalies(baselines, current_news, start_date, end_date):
+    """Score every species' period count against its seasonal baseline.
+
+    Daily counts are treated as negative binomial, with the dispersion taken
+    from the comparison days by the method of moments. The period variance
+    also carries the uncertainty of the estimated daily mean.
+    """
+    comp = baseline_comparison(baselines, current_news, start_date, end_date)
+    n_days = comp["days"]
+    species = baselines["species_names"]
+    if n_days <= 0 or len(species) == 0:
+        return pd.DataFrame(columns=["Com_Name", "current", "expected", "z"])
+
+    period_days = (end_date - start_date).days + 1
+    daily_mean = comp["species"] / n_days
+    daily_var = np.maximum(comp["species_sq"] / n_days - daily_mean ** 2, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dispersion = np.where(daily_mean > 0, np.maximum(daily_var - daily_mean, 0) / daily_mean ** 2, 0)
+    nb_var = daily_mean + dispersion * daily_mean ** 2
+    expected = daily_mean * period_days
+    variance = period_days * nb_var + period_days ** 2 * nb_var / n_days
+
+    current = (
+        current_news["Com_Name"].value_counts()
+        .reindex(species, fill_value=0)
+        .to_numpy()
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(variance > 0, (current - expected) / np.sqrt(variance), 0.0)
+    return pd.DataFrame({"Com_Name": species, "current": current, "expected": expected, "z": z})
 
 
 def decimal_hour(ts):
@@ -928,32 +2067,70 @@ def minutes_text(minutes):
     return f"{hours}h {remainder}m"
 
 
-def longest_date_streak(dates):
-    unique_days = sorted(set(dates))
-    if not unique_days:
+_EPOCH_DATE = datetime.date(1970, 1, 1)
+
+
+def day_ordinal(date_value):
+    return (date_value - _EPOCH_DATE).days
+
+
+def build_streak_index(data):
+    """Run-length encode the days each species was detected.
+
+    Returns {species: (run_starts, run_ends)} where both arrays hold day
+    ordinals (days since 1970-01-01) and runs are sorted by start.
+    """
+    if len(data) == 0:
+        return {}
+    valid = data["timestamp"].notna() & data["Com_Name"].notna()
+    if not valid.any():
+        return {}
+    codes, species_names = pd.factorize(data.loc[valid, "Com_Name"].astype(str), sort=True)
+    days = data.loc[valid, "timestamp"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    first_day = days.min()
+    # One sorted pass over unique (species, day) pairs.
+    keys = np.unique(codes.astype(np.int64) << 32 | (days - first_day))
+    species = keys >> 32
+    days = (keys & 0xFFFFFFFF) + first_day
+
+    new_species = np.r_[True, species[1:] != species[:-1]]
+    run_starts_at = np.flatnonzero(new_species | np.r_[True, np.diff(days) != 1])
+    run_ends_at = np.r_[run_starts_at[1:] - 1, len(days) - 1]
+    run_species = species[run_starts_at]
+    starts = days[run_starts_at]
+    ends = days[run_ends_at]
+
+    bounds = np.flatnonzero(np.r_[True, run_species[1:] != run_species[:-1]])
+    index = {}
+    for lo, hi in zip(bounds, np.r_[bounds[1:], len(run_species)]):
+        index[species_names[run_species[lo]]] = (starts[lo:hi], ends[lo:hi])
+    return index
+
+
+def longest_streak(streak_index, species):
+    runs = streak_index.get(species)
+    if runs is None or len(runs[0]) == 0:
         return 0
-    best = 1
-    current = 1
-    for i in range(1, len(unique_days)):
-        if (unique_days[i] - unique_days[i - 1]).days == 1:
-            current += 1
-            best = max(best, current)
-        else:
-            current = 1
-    return best
+    return int((runs[1] - runs[0]).max()) + 1
 
 
-def streak_ending_at(dates, end_date):
-    unique_days = sorted(set(d for d in dates if d <= end_date))
-    if not unique_days or unique_days[-1] != end_date:
+def streak_ending_at(streak_index, species, end_date):
+    runs = streak_index.get(species)
+    if runs is None or len(runs[0]) == 0:
         return 0
-    streak = 1
-    for i in range(len(unique_days) - 1, 0, -1):
-        if (unique_days[i] - unique_days[i - 1]).days == 1:
-            streak += 1
-        else:
-            break
-    return streak
+    day = day_ordinal(end_date)
+    run_idx = int(np.searchsorted(runs[0], day, side="right")) - 1
+    if run_idx < 0 or runs[1][run_idx] < day:
+        return 0
+    return int(day - runs[0][run_idx]) + 1
+
+
+def longest_streak_table(streak_index):
+    species = sorted(streak_index)
+    return pd.DataFrame({
+        "Com_Name": species,
+        "Longest_Streak": [longest_streak(streak_index, sp) for sp in species],
+    })
 
 
 def daily_species_sets(data):
@@ -974,7 +2151,161 @@ def species_mix_similarity(current_counts, comparison_counts):
     return float(np.dot(current_vec, comparison_vec) / denom)
 
 
-def add_period_record_insights(all_news, current_news, start_date, end_date, insights):
+@dataclass(frozen=True)
+class NewsContext:
+    """Everything the headline generators and charts read for one period.
+
+    History-wide fields are shared between periods of the same dataset
+    generation; treat every field as read-only.
+    """
+    generation: object
+    start_date: datetime.date
+    end_date: datetime.date
+    period_days: int
+    all_news: pd.DataFrame
+    current_news: pd.DataFrame
+    daily_counts: pd.Series      # detections per calendar day, gaps filled with 0
+    daily_species: pd.Series     # distinct species per calendar day
+    rolling_species: pd.Series   # distinct species in each trailing period_days window
+    species_by_date: dict
+    hourly_counts: np.ndarray    # selected-period detections per hour 0-23
+    baselines: dict
+    event_index: dict
+    streak_index: dict
+    sun: pd.DataFrame = None     # sun_table over the history, None without a location
+
+
+def build_news_history(all_data, events, location=None):
+    """History-wide pieces of the news context.
+
+    `location` is the (lat, lon) of the recording station, used for the
+    offline sunrise table.
+    """
+    all_news = prepare_news_df(all_data)
+    baselines = build_news_baselines(all_news)
+    species = baselines["species_names"]
+    history = {
+        "all_news": all_news,
+        "baselines": baselines,
+        "event_index": compile_garden_events(events, tuple(species)),
+        "streak_index": build_streak_index(all_news),
+        "species_by_date": daily_species_sets(all_news),
+        "presence": np.zeros((0, len(species)), dtype=bool),
+        "all_dates": np.array([], dtype=object),
+        "sun": None,
+    }
+    if len(all_news) == 0:
+        return history
+
+    days = all_news["timestamp"].to_numpy().astype("datetime64[D]")
+    first_day = days.min()
+    day_codes = (days - first_day).astype(np.int64)
+    n_days = int(day_codes.max()) + 1
+    named = all_news["Com_Name"].notna().to_numpy()
+    codes = np.searchsorted(species, all_news["Com_Name"].to_numpy()[named].astype(str))
+    presence = np.zeros((n_days, len(species)), dtype=bool)
+    presence[day_codes[named], codes] = True
+    history["presence"] = presence
+    history["all_dates"] = pd.date_range(pd.Timestamp(first_day), periods=n_days, freq="D").date
+    history["daily_counts"] = pd.Series(np.bincount(day_codes, minlength=n_days), index=history["all_dates"])
+    if location is not None and pd.notna(location[0]) and pd.notna(location[1]):
+        history["sun"] = sun_table(location[0], location[1], history["all_dates"][0], history["all_dates"][-1])
+    return history
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def cached_news_history(_all_data, events, generation, location=None):
+    return build_news_history(_all_data, events, location)
+
+
+def build_news_context(all_data, period_data, start_date, end_date, events, generation=None, location=None):
+    """Build the NewsContext for a period.
+
+    With a dataset `generation`, the history-wide pieces are cached and
+    shared across periods instead of being rebuilt for each one.
+    """
+    if generation is None:
+        history = build_news_history(all_data, events, location)
+    else:
+        history = cached_news_history(all_data, events, generation, location)
+
+    current_news = prepare_news_df(period_data)
+    period_days = (end_date - start_date).days + 1
+    all_dates = history["all_dates"]
+    presence = history["presence"]
+    if len(all_dates) >= period_days:
+        window = np.concatenate([np.zeros((1, presence.shape[1]), dtype=np.int64), presence.cumsum(axis=0)])
+        rolling = ((window[period_days:] - window[:-period_days]) > 0).sum(axis=1)
+        rolling_species = pd.Series(rolling, index=all_dates[period_days - 1:])
+    else:
+        rolling_species = pd.Series(dtype=int)
+    hourly_counts = (
+        np.bincount(current_news["hour"].to_numpy(), minlength=24)
+        if len(current_news) else np.zeros(24, dtype=int)
+    )
+
+    return NewsContext(
+        generation=generation,
+        start_date=start_date,
+        end_date=end_date,
+        period_days=period_days,
+        all_news=history["all_news"],
+        current_news=current_news,
+        daily_counts=history.get("daily_counts", pd.Series(dtype=int)),
+        daily_species=pd.Series(presence.sum(axis=1), index=all_dates),
+        rolling_species=rolling_species,
+        species_by_date=history["species_by_date"],
+        hourly_counts=hourly_counts,
+        baselines=history["baselines"],
+        event_index=history["event_index"],
+        streak_index=history["streak_index"],
+        sun=history["sun"],
+    )
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def cached_station_baselines(_station_news, generation, station):
+    return build_news_baselines(_station_news)
+
+
+def station_period_summary(ctx):
+    """Detections, species and expected detections per station for the period.
+
+    Each station's history is baselined on its own, one station per worker
+    thread, and cached per dataset generation.
+    """
+    if len(ctx.all_news) == 0 or "Station" not in ctx.all_news.columns:
+        return pd.DataFrame()
+
+    history = dict(tuple(ctx.all_news.groupby("Station")))
+    current = dict(tuple(ctx.current_news.groupby("Station"))) if len(ctx.current_news) else {}
+
+    def summarise(station):
+        station_news = history[station]
+        if ctx.generation is None:
+            baselines = build_news_baselines(station_news)
+        else:
+            baselines = cached_station_baselines(station_news, ctx.generation, station)
+        period_news = current.get(station, ctx.current_news.iloc[0:0])
+        expected = expected_count_for_period(baselines, period_news, ctx.start_date, ctx.end_date)
+        change = pct_change(len(period_news), expected)
+        return {
+            "Station": station,
+            "Detections": len(period_news),
+            "Species": period_news["Com_Name"].nunique(),
+            "Expected": round(expected) if expected is not None else None,
+            "Vs expected": signed_pct_label(change) if change is not None else "—",
+            "Mean confidence": round(period_news["Confidence"].mean(), 2) if len(period_news) else None,
+        }
+
+    rows = map_with_script_ctx(summarise, sorted(history))
+    return pd.DataFrame(rows).sort_values("Detections", ascending=False, kind="stable")
+
+
+def add_period_record_insights(ctx, insights):
+    all_news = ctx.all_news
+    current_news = ctx.current_news
+    start_date, end_date = ctx.start_date, ctx.end_date
     if len(all_news) == 0 or len(current_news) == 0:
         return
 
@@ -983,9 +2314,7 @@ def add_period_record_insights(all_news, current_news, start_date, end_date, ins
     current_count = len(current_news)
     current_species = current_news["Com_Name"].nunique()
 
-    all_dates = pd.date_range(all_news["date"].min(), all_news["date"].max(), freq="D").date
-    daily_counts = all_news.groupby("date").size().reindex(all_dates, fill_value=0)
-    rolling_counts = daily_counts.rolling(period_days, min_periods=period_days).sum().dropna()
+    rolling_counts = ctx.daily_counts.rolling(period_days, min_periods=period_days).sum().dropna()
 
     if len(rolling_counts) >= 5:
         max_count = int(rolling_counts.max())
@@ -1022,7 +2351,7 @@ def add_period_record_insights(all_news, current_news, start_date, end_date, ins
                 )
 
     if period_days == 1:
-        daily_species = all_news.groupby("date")["Com_Name"].nunique().reindex(all_dates, fill_value=0)
+        daily_species = ctx.daily_species
         if len(daily_species) >= 5 and current_species >= int(daily_species.max()) and current_species > 0:
             add_insight(
                 insights,
@@ -1045,7 +2374,11 @@ def add_period_record_insights(all_news, current_news, start_date, end_date, ins
                 )
 
 
-def add_arrival_insights(all_news, current_news, start_date, end_date, events, insights):
+def add_arrival_insights(ctx, insights):
+    all_news = ctx.all_news
+    current_news = ctx.current_news
+    start_date, end_date = ctx.start_date, ctx.end_date
+    events = ctx.event_index
     if len(all_news) == 0 or len(current_news) == 0:
         return
 
@@ -1127,57 +2460,58 @@ def add_arrival_insights(all_news, current_news, start_date, end_date, events, i
         )
 
 
-def add_species_change_insights(all_news, current_news, start_date, end_date, events, insights):
+def add_species_change_insights(ctx, insights):
+    all_news = ctx.all_news
+    current_news = ctx.current_news
+    start_date, end_date = ctx.start_date, ctx.end_date
+    events = ctx.event_index
+    baselines = ctx.baselines
     if len(all_news) == 0 or len(current_news) == 0:
         return
 
-    period_days = (end_date - start_date).days + 1
     months = set(current_news["month_num"].dropna().astype(int).unique().tolist())
-    current_counts = current_news["Com_Name"].value_counts()
-
-    comparison = all_news[
-        ~((all_news["date"] >= start_date) & (all_news["date"] <= end_date)) &
-        (all_news["month_num"].isin(months))
-    ].copy()
-    comparison_days = comparison["date"].nunique()
-    if comparison_days < max(7, period_days):
-        comparison = all_news[
-            ~((all_news["date"] >= start_date) & (all_news["date"] <= end_date))
-        ].copy()
-        comparison_days = comparison["date"].nunique()
-    if comparison_days == 0:
+    scores = score_species_anomalies(baselines, current_news, start_date, end_date)
+    if len(scores) == 0:
         return
 
-    baseline_counts = comparison["Com_Name"].value_counts()
-    species = sorted(set(current_counts.index).union(set(baseline_counts.index)))
+    # Most extreme first, so the top three of each kind are the strongest.
+    spike_rows = scores[
+        (scores["z"] >= ANOMALY_SPIKE_Z) &
+        (scores["expected"] >= 5) &
+        (scores["current"] >= scores["expected"] + 10) &
+        (scores["current"] >= scores["expected"] * ANOMALY_SPIKE_RATIO)
+    ].sort_values("z", ascending=False)
+    drop_rows = scores[
+        (scores["z"] <= ANOMALY_DROP_Z) &
+        (scores["expected"] >= 10) &
+        (scores["current"] <= scores["expected"] * ANOMALY_DROP_RATIO)
+    ].sort_values("z")
 
     spikes = []
+    for sp, current, expected in spike_rows[["Com_Name", "current", "expected"]].itertuples(index=False):
+        event_matches = matching_events(sp, events, trigger="spike", months=months)
+        change = pct_change(current, expected)
+        headline = event_matches[0].get("label", f"{sp} activity spiked") if event_matches else f"{sp} activity spiked"
+        spikes.append((
+            84 if event_matches else 70,
+            headline,
+            f"{current:,} detections vs about {expected:.0f} expected for this period ({signed_pct_label(change)}).",
+            sp,
+            {"type": "species_recent", "species": sp},
+        ))
+
     drops = []
-    for sp in species:
-        expected = (baseline_counts.get(sp, 0) / comparison_days) * period_days
-        current = int(current_counts.get(sp, 0))
-        if expected >= 5 and current >= max(expected * 2.5, expected + 10):
-            event_matches = matching_events(sp, events, trigger="spike", months=months)
-            change = pct_change(current, expected)
-            headline = event_matches[0].get("label", f"{sp} activity spiked") if event_matches else f"{sp} activity spiked"
-            spikes.append((
-                84 if event_matches else 70,
-                headline,
-                f"{current:,} detections vs about {expected:.0f} expected for this period ({signed_pct_label(change)}).",
-                sp,
-                {"type": "species_recent", "species": sp},
-            ))
-        elif expected >= 10 and current <= expected * 0.35:
-            event_matches = matching_events(sp, events, trigger="drop_vs_last_year", months=months)
-            change = pct_change(current, expected)
-            headline = event_matches[0].get("label", f"{sp} unusually quiet") if event_matches else f"{sp} unusually quiet"
-            drops.append((
-                82 if event_matches else 68,
-                headline,
-                f"{current:,} detections vs about {expected:.0f} expected for this period ({signed_pct_label(change)}).",
-                sp,
-                {"type": "species_recent", "species": sp},
-            ))
+    for sp, current, expected in drop_rows[["Com_Name", "current", "expected"]].itertuples(index=False):
+        event_matches = matching_events(sp, events, trigger="drop_vs_last_year", months=months)
+        change = pct_change(current, expected)
+        headline = event_matches[0].get("label", f"{sp} unusually quiet") if event_matches else f"{sp} unusually quiet"
+        drops.append((
+            82 if event_matches else 68,
+            headline,
+            f"{current:,} detections vs about {expected:.0f} expected for this period ({signed_pct_label(change)}).",
+            sp,
+            {"type": "species_recent", "species": sp},
+        ))
 
     for priority, headline, detail, species_name, chart in sorted(spikes, key=lambda row: row[0], reverse=True)[:3]:
         add_insight(insights, priority, "Species", headline, detail, species_name, chart=chart)
@@ -1185,8 +2519,11 @@ def add_species_change_insights(all_news, current_news, start_date, end_date, ev
         add_insight(insights, priority, "Species", headline, detail, species_name, chart=chart)
 
 
-def add_event_ytd_insights(all_news, end_date, events, insights):
-    if len(all_news) == 0:
+def add_event_ytd_insights(ctx, insights):
+    all_news = ctx.all_news
+    end_date = ctx.end_date
+    events = ctx.event_index
+    if len(all_news) == 0 or not events:
         return
 
     year = end_date.year
@@ -1199,7 +2536,7 @@ def add_event_ytd_insights(all_news, end_date, events, insights):
     except ValueError:
         prev_end = datetime.date(prev_year, 2, 28)
 
-    for event in events:
+    for event_id, event in enumerate(events["events"]):
         if event.get("trigger") != "drop_vs_last_year":
             continue
 
@@ -1212,8 +2549,8 @@ def add_event_ytd_insights(all_news, end_date, events, insights):
             (all_news["date"] <= prev_end)
         ].copy()
 
-        current_count = int(event_species_mask(current_year, event).sum())
-        previous_count = int(event_species_mask(prev_year_df, event).sum())
+        current_count = int(event_species_mask(current_year, events, event_id).sum())
+        previous_count = int(event_species_mask(prev_year_df, events, event_id).sum())
         if previous_count < 20:
             continue
 
@@ -1231,7 +2568,11 @@ def add_event_ytd_insights(all_news, end_date, events, insights):
             )
 
 
-def add_dawn_chorus_insights(all_news, current_news, start_date, end_date, weather_daily, insights):
+def add_dawn_chorus_insights(ctx, insights):
+    all_news = ctx.all_news
+    current_news = ctx.current_news
+    start_date, end_date = ctx.start_date, ctx.end_date
+    baselines = ctx.baselines
     if len(all_news) == 0 or len(current_news) == 0:
         return
 
@@ -1241,10 +2582,7 @@ def add_dawn_chorus_insights(all_news, current_news, start_date, end_date, weath
     if len(dawn) == 0:
         return
 
-    comp = comparison_window(all_news, current_news, start_date, end_date)
-    comp_dawn = comp[(comp["hour"] >= 3) & (comp["hour"] <= 10)].copy()
-    comp_days = comp["date"].nunique()
-    expected = (len(comp_dawn) / comp_days) * period_days if comp_days else None
+    expected = expected_count_for_period(baselines, current_news, start_date, end_date, hours=range(3, 11))
 
     if expected is not None and expected >= 5:
         change = pct_change(len(dawn), expected)
@@ -1283,11 +2621,16 @@ def add_dawn_chorus_insights(all_news, current_news, start_date, end_date, weath
                 chart=dawn_chart,
             )
 
-    if period_days == 1 and len(comp_dawn):
+    comp_first = baseline_first_dawn(
+        baselines,
+        baseline_comparison(baselines, current_news, start_date, end_date),
+        start_date,
+        end_date,
+    )
+    if period_days == 1 and len(comp_first):
         current_first = decimal_hour(dawn["timestamp"]).min()
-        comp_first = comp_dawn.groupby("date")["timestamp"].min()
         if len(comp_first) >= 7:
-            typical_first = decimal_hour(comp_first).median()
+            typical_first = float(np.median(comp_first))
             diff_minutes = (current_first - typical_first) * 60
             if diff_minutes <= -30:
                 add_insight(
@@ -1308,10 +2651,10 @@ def add_dawn_chorus_insights(all_news, current_news, start_date, end_date, weath
                     chart=dawn_chart,
                 )
 
-        if weather_daily is not None and len(weather_daily):
-            weather_match = weather_daily[weather_daily["date"] == end_date]
-            if len(weather_match) and pd.notna(weather_match.iloc[0].get("sunrise")):
-                sunrise = weather_match.iloc[0]["sunrise"]
+        if ctx.sun is not None and len(ctx.sun):
+            sun_match = ctx.sun[ctx.sun["date"] == end_date]
+            if len(sun_match) and pd.notna(sun_match.iloc[0]["sunrise"]):
+                sunrise = sun_match.iloc[0]["sunrise"]
                 sunrise_hour = sunrise.hour + sunrise.minute / 60.0
                 if current_first <= sunrise_hour - 0.5:
                     add_insight(
@@ -1324,7 +2667,9 @@ def add_dawn_chorus_insights(all_news, current_news, start_date, end_date, weath
                     )
 
 
-def add_expected_arrival_insights(all_news, current_news, start_date, end_date, insights):
+def add_expected_arrival_insights(ctx, insights):
+    all_news = ctx.all_news
+    end_date = ctx.end_date
     if len(all_news) == 0:
         return
 
@@ -1381,7 +2726,10 @@ def add_expected_arrival_insights(all_news, current_news, start_date, end_date,
         )
 
 
-def add_absence_comeback_insights(all_news, current_news, start_date, end_date, insights):
+def add_absence_comeback_insights(ctx, insights):
+    all_news = ctx.all_news
+    current_news = ctx.current_news
+    start_date, end_date = ctx.start_date, ctx.end_date
     if len(all_news) == 0:
         return
 
@@ -1437,7 +2785,10 @@ def add_absence_comeback_insights(all_news, current_news, start_date, end_date,
         )
 
 
-def add_community_mix_insights(all_news, current_news, start_date, end_date, insights):
+def add_community_mix_insights(ctx, insights):
+    all_news = ctx.all_news
+    current_news = ctx.current_news
+    start_date, end_date = ctx.start_date, ctx.end_date
     if len(current_news) == 0:
         return
 
@@ -1478,11 +2829,12 @@ def add_community_mix_insights(all_news, current_news, start_date, end_date, ins
         ~((all_news["date"] >= start_date) & (all_news["date"] <= end_date))
     ].copy()
     if total >= 25 and len(historical):
-        current_season = news_season_from_month(end_date.month)
+        current_season = season_from_month(end_date.month)
         current_counts = current_news["Com_Name"].value_counts()
+        historical_seasons = seasons(historical["month_num"])
         season_scores = []
-        for season in ["Spring", "Summer", "Autumn", "Winter"]:
-            season_data = historical[historical["month_num"].apply(news_season_from_month) == season]
+        for season in SEASONS:
+            season_data = historical[historical_seasons == season]
             if season_data["date"].nunique() < 7:
                 continue
             score = species_mix_similarity(current_counts, season_data["Com_Name"].value_counts())
@@ -1501,24 +2853,13 @@ def add_community_mix_insights(all_news, current_news, start_date, end_date, ins
                     f"The current species mix matched historic {best_season.lower()} patterns more closely than {current_season.lower()}.",
                 )
 
-    period_days = (end_date - start_date).days + 1
-    all_dates = pd.date_range(all_news["date"].min(), all_news["date"].max(), freq="D").date
-    species_by_date = all_news.groupby("date")["Com_Name"].apply(lambda x: set(x.dropna())).to_dict()
-    rolling_species = []
-    for idx, day in enumerate(all_dates):
-        if idx + 1 < period_days:
-            continue
-        window_species = set()
-        for window_day in all_dates[idx + 1 - period_days:idx + 1]:
-            window_species.update(species_by_date.get(window_day, set()))
-        rolling_species.append({"date": day, "species_count": len(window_species)})
-
-    rolling_df = pd.DataFrame(rolling_species)
-    if len(rolling_df) >= 5:
+    period_days = ctx.period_days
+    rolling_species = ctx.rolling_species
+    if len(rolling_species) >= 5:
         current_species = current_news["Com_Name"].nunique()
-        before_current = rolling_df[rolling_df["date"] < end_date]
-        median_species = rolling_df["species_count"].median()
-        if len(before_current) and current_species >= before_current["species_count"].max() and current_species > 0:
+        before_current = rolling_species[rolling_species.index < end_date]
+        median_species = rolling_species.median()
+        if len(before_current) and current_species >= before_current.max() and current_species > 0:
             add_insight(
                 insights,
                 83,
@@ -1540,7 +2881,10 @@ def add_community_mix_insights(all_news, current_news, start_date, end_date, ins
                 )
 
 
-def add_time_of_day_insights(all_news, current_news, start_date, end_date, insights):
+def add_time_of_day_insights(ctx, insights):
+    current_news = ctx.current_news
+    start_date, end_date = ctx.start_date, ctx.end_date
+    baselines = ctx.baselines
     if len(current_news) == 0:
         return
 
@@ -1572,17 +2916,17 @@ def add_time_of_day_insights(all_news, current_news, start_date, end_date, insig
                 chart={"type": "hourly_activity", "highlight_hours": [peak_hour]},
             )
 
-    comp = comparison_window(all_news, current_news, start_date, end_date)
-    comp_days = comp["date"].nunique()
-    if comp_days == 0:
+    comp = baseline_comparison(baselines, current_news, start_date, end_date)
+    comp_days = comp["days"]
+    if comp_days <= 0:
         return
 
-    for label, mask_fn, priority, highlight_hours in [
-        ("evening", lambda data: (data["hour"] >= 17) & (data["hour"] < 22), 66, list(range(17, 22))),
-        ("night", lambda data: (data["hour"] >= 22) | (data["hour"] < 5), 64, [22, 23, 0, 1, 2, 3, 4]),
+    for label, priority, highlight_hours in [
+        ("evening", 66, list(range(17, 22))),
+        ("night", 64, [22, 23, 0, 1, 2, 3, 4]),
     ]:
-        current_count = int(mask_fn(current_news).sum())
-        expected = (int(mask_fn(comp).sum()) / comp_days) * period_days
+        current_count = int(current_news["hour"].isin(highlight_hours).sum())
+        expected = (comp["hours"][highlight_hours].sum() / comp_days) * period_days
         if expected >= 5 and current_count >= max(expected * 2.0, expected + 10):
             add_insight(
                 insights,
@@ -1594,12 +2938,15 @@ def add_time_of_day_insights(all_news, current_news, start_date, end_date, insig
             )
 
 
-def add_weather_insights(all_news, current_news, start_date, end_date, weather_daily, insights):
+def add_weather_insights(ctx, insights, weather_daily=None):
+    current_news = ctx.current_news
+    start_date, end_date = ctx.start_date, ctx.end_date
+    baselines = ctx.baselines
     if weather_daily is None or len(weather_daily) == 0 or len(current_news) == 0:
         return
 
     period_days = (end_date - start_date).days + 1
-    typical = expected_count_for_period(all_news, current_news, start_date, end_date)
+    typical = expected_count_for_period(baselines, current_news, start_date, end_date)
     current_total = len(current_news)
     rain_total = weather_daily["precip_sum"].sum()
     peak_wind = weather_daily["wind_max"].max()
@@ -1655,16 +3002,20 @@ def add_weather_insights(all_news, current_news, start_date, end_date, weather_d
                 )
 
 
-def add_record_streak_insights(all_news, current_news, start_date, end_date, insights):
+def add_record_streak_insights(ctx, insights):
+    all_news = ctx.all_news
+    current_news = ctx.current_news
+    start_date, end_date = ctx.start_date, ctx.end_date
+    baselines = ctx.baselines
     if len(all_news) == 0 or len(current_news) == 0:
         return
 
     current_species = set(current_news["Com_Name"].dropna().unique())
+    streak_index = ctx.streak_index
     streaks = []
     for species in current_species:
-        species_dates = all_news[all_news["Com_Name"] == species]["date"].tolist()
-        current_streak = streak_ending_at(species_dates, end_date)
-        best_streak = longest_date_streak(species_dates)
+        current_streak = streak_ending_at(streak_index, species, end_date)
+        best_streak = longest_streak(streak_index, species)
         if current_streak >= 7 and current_streak >= best_streak:
             streaks.append((current_streak, species, True))
         elif current_streak >= 14:
@@ -1685,10 +3036,10 @@ def add_record_streak_insights(all_news, current_news, start_date, end_date, ins
 
     if "Confidence" in current_news.columns and current_news["Confidence"].notna().any():
         period_days = (end_date - start_date).days + 1
-        comp = comparison_window(all_news.dropna(subset=["Confidence"]), current_news, start_date, end_date)
-        if len(comp) and comp["Confidence"].notna().any():
+        comp = baseline_comparison(baselines, current_news, start_date, end_date)
+        if comp["conf_rows"] > 0:
             current_conf = current_news["Confidence"].mean()
-            comp_conf = comp["Confidence"].mean()
+            comp_conf = comp["conf_sum"] / comp["conf_rows"]
             if current_conf >= 0.85 and current_conf >= comp_conf + 0.08 and len(current_news) >= 10:
                 add_insight(
                     insights,
@@ -1701,8 +3052,11 @@ def add_record_streak_insights(all_news, current_news, start_date, end_date, ins
         if period_days == 1:
             current_species_set = set(current_news["Com_Name"].dropna().astype(str).value_counts().head(3).index)
             if len(current_species_set) >= 3:
-                previous_sets = daily_species_sets(all_news[all_news["date"] < start_date])
-                seen_before = any(current_species_set.issubset(species_set) for species_set in previous_sets.values())
+                seen_before = any(
+                    current_species_set.issubset(species_set)
+                    for day, species_set in ctx.species_by_date.items()
+                    if day < start_date
+                )
                 if not seen_before:
                     add_insight(
                         insights,
@@ -1713,7 +3067,10 @@ def add_record_streak_insights(all_news, current_news, start_date, end_date, ins
                     )
 
 
-def add_data_quality_insights(all_news, current_news, start_date, end_date, insights):
+def add_data_quality_insights(ctx, insights):
+    current_news = ctx.current_news
+    start_date, end_date = ctx.start_date, ctx.end_date
+    baselines = ctx.baselines
     if len(current_news) == 0:
         return
 
@@ -1747,8 +3104,8 @@ def add_data_quality_insights(all_news, current_news, start_date, end_date, insi
         period_days = (end_date - start_date).days + 1
         low_conf = current_news[current_news["Confidence"] <= 0.70]
         low_rate = len(low_conf) / max(len(current_news), 1)
-        comp = comparison_window(all_news.dropna(subset=["Confidence"]), current_news, start_date, end_date)
-        comp_low_rate = (comp["Confidence"] <= 0.70).mean() if len(comp) else 0
+        comp = baseline_comparison(baselines, current_news, start_date, end_date)
+        comp_low_rate = comp["low_conf"] / comp["conf_rows"] if comp["conf_rows"] > 0 else 0
         if len(low_conf) >= 10 and low_rate >= max(0.20, comp_low_rate * 2):
             add_insight(
                 insights,
@@ -1759,8 +3116,12 @@ def add_data_quality_insights(all_news, current_news, start_date, end_date, insi
             )
 
 
-def add_garden_event_watch_insights(all_news, current_news, end_date, events, insights):
-    if len(all_news) == 0:
+def add_garden_event_watch_insights(ctx, insights):
+    all_news = ctx.all_news
+    current_news = ctx.current_news
+    end_date = ctx.end_date
+    events = ctx.event_index
+    if len(all_news) == 0 or not events:
         return
 
     year = end_date.year
@@ -1769,13 +3130,13 @@ def add_garden_event_watch_insights(all_news, current_news, end_date, events, in
         (all_news["year"] == year) &
         (all_news["date"] <= end_date)
     ].copy()
-    for event in events:
-        event_months = set(event.get("months", []))
-        if event_months and month not in event_months:
+    for event_id, event in enumerate(events["events"]):
+        event_bits = events["month_bits"][event_id]
+        if event_bits and not event_bits & (1 << month):
             continue
 
         if event.get("trigger") == "first_seen_year":
-            seen_this_year = int(event_species_mask(year_df, event).sum()) > 0
+            seen_this_year = int(event_species_mask(year_df, events, event_id).sum()) > 0
             if not seen_this_year:
                 add_insight(
                     insights,
@@ -1785,7 +3146,7 @@ def add_garden_event_watch_insights(all_news, current_news, end_date, events, in
                     "No matching detections yet this year, but this is the usual seasonal window.",
                 )
         elif event.get("trigger") == "spike" and len(current_news):
-            current_count = int(event_species_mask(current_news, event).sum())
+            current_count = int(event_species_mask(current_news, events, event_id).sum())
             if current_count >= 5:
                 add_insight(
                     insights,
@@ -1796,30 +3157,111 @@ def add_garden_event_watch_insights(all_news, current_news, end_date, events, in
                 )
 
 
-def build_news_insights(all_data, period_data, start_date, end_date, events, weather_daily=None):
-    all_news = prepare_news_df(all_data)
-    current_news = prepare_news_df(period_data)
-    insights = []
+# ---- Insight generator registry ----
+# Generators run in registration order and receive the NewsContext. Each one
+# declares which inputs it reads ("history" is the full detection history,
+# "events" the compiled garden events, "baselines" the day-of-year baseline
+# store, "sun" the offline sunrise table, "weather" the daily Open-Meteo
+# frame, which is passed separately as it can arrive late) and a wall-time
+# budget so slow generators stand out in the feed profile.
+NEWS_GENERATOR_INPUTS = ("history", "weather", "events", "baselines", "sun")
+NEWS_GENERATORS = {}
 
-    if start_date is None or end_date is None:
-        return insights
-    if len(current_news) == 0:
-        return insights
-
-    add_period_record_insights(all_news, current_news, start_date, end_date, insights)
-    add_arrival_insights(all_news, current_news, start_date, end_date, events, insights)
-    add_expected_arrival_insights(all_news, current_news, start_date, end_date, insights)
-    add_species_change_insights(all_news, current_news, start_date, end_date, events, insights)
-    add_event_ytd_insights(all_news, end_date, events, insights)
-    add_dawn_chorus_insights(all_news, current_news, start_date, end_date, weather_daily, insights)
-    add_absence_comeback_insights(all_news, current_news, start_date, end_date, insights)
-    add_community_mix_insights(all_news, current_news, start_date, end_date, insights)
-    add_time_of_day_insights(all_news, current_news, start_date, end_date, insights)
-    add_weather_insights(all_news, current_news, start_date, end_date, weather_daily, insights)
-    add_record_streak_insights(all_news, current_news, start_date, end_date, insights)
-    add_data_quality_insights(all_news, current_news, start_date, end_date, insights)
-    add_garden_event_watch_insights(all_news, current_news, end_date, events, insights)
 
+def register_news_generator(name, category, fn, needs=("history",), budget_ms=50):
+    unknown = set(needs) - set(NEWS_GENERATOR_INPUTS)
+    if unknown:
+        raise ValueError(f"Unknown insight generator inputs for {name}: {sorted(unknown)}")
+    NEWS_GENERATORS[name] = {
+        "name": name,
+        "category": category,
+        "fn": fn,
+        "needs": tuple(needs),
+        "budget_ms": budget_ms,
+    }
+
+
+register_news_generator("period_records", "Record", add_period_record_insights, budget_ms=60)
+register_news_generator("arrivals", "Arrival", add_arrival_insights, needs=("history", "events"), budget_ms=80)
+register_news_generator("expected_arrivals", "Seasonal timing", add_expected_arrival_insights, budget_ms=60)
+register_news_generator("species_changes", "Species", add_species_change_insights, needs=("baselines", "events"), budget_ms=80)
+register_news_generator("event_year_to_date", "Garden year", add_event_ytd_insights, needs=("history", "events"), budget_ms=40)
+register_news_generator("dawn_chorus", "Dawn chorus", add_dawn_chorus_insights, needs=("baselines", "sun"), budget_ms=60)
+register_news_generator("absence_comeback", "Comeback", add_absence_comeback_insights, budget_ms=120)
+register_news_generator("community_mix", "Community mix", add_community_mix_insights, budget_ms=150)
+register_news_generator("time_of_day", "Time of day", add_time_of_day_insights, needs=("baselines",), budget_ms=40)
+register_news_generator("weather", "Weather", add_weather_insights, needs=("baselines", "weather"), budget_ms=40)
+register_news_generator("record_streaks", "Record", add_record_streak_insights, needs=("history", "baselines"), budget_ms=150)
+register_news_generator("data_quality", "Data quality", add_data_quality_insights, needs=("baselines",), budget_ms=40)
+register_news_generator("garden_event_watch", "Garden year", add_garden_event_watch_insights, needs=("history", "events"), budget_ms=40)
+
+
+def run_news_generator(generator, ctx, insights, weather_daily=None):
+    """Run one registered generator and return its profile row."""
+    kwargs = {}
+    rows_scanned = len(ctx.current_news)
+    if "history" in generator["needs"]:
+        rows_scanned += len(ctx.all_news)
+    if "weather" in generator["needs"]:
+        kwargs["weather_daily"] = weather_daily
+        if weather_daily is not None:
+            rows_scanned += len(weather_daily)
+
+    produced_before = len(insights)
+    started = time.perf_counter()
+    generator["fn"](ctx, insights, **kwargs)
+    wall_ms = (time.perf_counter() - started) * 1000
+    return {
+        "generator": generator["name"],
+        "category": generator["category"],
+        "needs": ", ".join(generator["needs"]),
+        "enabled": True,
+        "insights": len(insights) - produced_before,
+        "rows_scanned": rows_scanned,
+        "wall_ms": wall_ms,
+        "budget_ms": generator["budget_ms"],
+        "over_budget": wall_ms > generator["budget_ms"],
+    }
+
+
+def news_generator_names(weather=None):
+    """Registered generator names; `weather` keeps only those that do (True) or do not (False) read weather."""
+    return [
+        name for name, generator in NEWS_GENERATORS.items()
+        if weather is None or ("weather" in generator["needs"]) == weather
+    ]
+
+
+def run_news_generators(names, ctx, weather_daily=None, disabled=(), profile=None):
+    """Run the named generators and return their insights keyed by generator."""
+    produced = {}
+    for name in names:
+        generator = NEWS_GENERATORS[name]
+        if name in disabled:
+            if profile is not None:
+                profile.append({
+                    "generator": name,
+                    "category": generator["category"],
+                    "needs": ", ".join(generator["needs"]),
+                    "enabled": False,
+                    "insights": 0,
+                    "rows_scanned": 0,
+                    "wall_ms": 0.0,
+                    "budget_ms": generator["budget_ms"],
+                    "over_budget": False,
+                })
+            continue
+        insights = []
+        row = run_news_generator(generator, ctx, insights, weather_daily)
+        produced[name] = insights
+        if profile is not None:
+            profile.append(row)
+    return produced
+
+
+def merge_news_insights(produced):
+    """Deduplicated headlines, highest priority first and registry order within a priority."""
+    insights = [insight for name in NEWS_GENERATORS for insight in produced.get(name, [])]
     seen = set()
     deduped = []
     for insight in sorted(insights, key=lambda x: x["priority"], reverse=True):
@@ -1831,33 +3273,40 @@ def build_news_insights(all_data, period_data, start_date, end_date, events, wea
     return deduped
 
 
-def select_visible_news_insights(news_insights, limit=VISIBLE_HEADLINE_LIMIT):
+def select_visible_news_insights(news_insights, limit=VISIBLE_HEADLINE_LIMIT, quota=NEWS_CATEGORY_QUOTA):
+    """Pick the visible headlines from the ranked list.
+
+    The top headline of every category is always shown. Remaining slots go
+    to the highest-ranked others, at most `quota` per category unless slots
+    would otherwise stay empty. Ranked order is kept.
+    """
     if len(news_insights) <= limit:
         return news_insights
 
-    selected = news_insights[:limit]
-
-    for candidate in news_insights[limit:]:
-        category = candidate["category"]
-        visible_categories = {insight["category"] for insight in selected}
-        if category in visible_categories:
+    chosen = set()
+    category_counts = {}
+    for idx, insight in enumerate(news_insights):
+        if insight["category"] not in category_counts:
+            category_counts[insight["category"]] = 1
+            chosen.add(idx)
+
+    slots = max(limit, len(chosen)) - len(chosen)
+    over_quota = []
+    for idx, insight in enumerate(news_insights):
+        if slots == 0:
+            break
+        if idx in chosen:
             continue
-
-        category_counts = pd.Series([insight["category"] for insight in selected]).value_counts().to_dict()
-        replace_idx = None
-        for idx in range(len(selected) - 1, -1, -1):
-            selected_category = selected[idx]["category"]
-            if category_counts.get(selected_category, 0) > 1:
-                replace_idx = idx
-                break
-
-        if replace_idx is None:
-            selected.append(candidate)
+        category = insight["category"]
+        if category_counts[category] < quota:
+            category_counts[category] += 1
+            chosen.add(idx)
+            slots -= 1
         else:
-            selected[replace_idx] = candidate
+            over_quota.append(idx)
+    chosen.update(over_quota[:slots])
 
-    selected = sorted(selected, key=lambda insight: news_insights.index(insight))
-    return selected
+    return [news_insights[idx] for idx in sorted(chosen)]
 
 
 def news_chart_start(all_news, end_date, period_days):
@@ -1886,14 +3335,13 @@ def style_news_fig(fig):
     return fig
 
 
-def render_activity_period_chart(all_data, start_date, end_date, chart_key):
-    all_news = prepare_news_df(all_data)
+def activity_period_chart_data(ctx):
+    all_news = ctx.all_news
     if len(all_news) == 0:
-        return False
+        return None
 
-    period_days = (end_date - start_date).days + 1
-    all_dates = pd.date_range(all_news["date"].min(), end_date, freq="D").date
-    daily_counts = all_news.groupby("date").size().reindex(all_dates, fill_value=0)
+    start_date, end_date, period_days = ctx.start_date, ctx.end_date, ctx.period_days
+    daily_counts = ctx.daily_counts[ctx.daily_counts.index <= end_date]
 
     if period_days == 1:
         series = daily_counts
@@ -1906,7 +3354,7 @@ def render_activity_period_chart(all_data, start_date, end_date, chart_key):
     chart_df = series.rename("Detections").reset_index().rename(columns={"index": "date"})
     chart_df = chart_df[chart_df["date"] >= chart_start].copy()
     if len(chart_df) == 0:
-        return False
+        return None
 
     chart_df["Selected"] = chart_df["date"].apply(
         lambda d: "Selected" if start_date <= d <= end_date else "Other"
@@ -1914,19 +3362,28 @@ def render_activity_period_chart(all_data, start_date, end_date, chart_key):
     if period_days > 1:
         chart_df["Selected"] = chart_df["date"].apply(lambda d: "Selected" if d == end_date else "Other")
 
+    return {
+        "type": "activity_period",
+        "chart_df": chart_df,
+        "y_title": y_title,
+        "median": float(series.median()) if len(series) else 0,
+    }
+
+
+def draw_activity_period_chart(data, chart_key):
+    chart_df = data["chart_df"]
     fig = px.bar(
         chart_df,
         x="date",
         y="Detections",
         color="Selected",
         title="",
-        labels={"date": "Date", "Detections": y_title, "Selected": ""},
+        labels={"date": "Date", "Detections": data["y_title"], "Selected": ""},
         color_discrete_map={"Selected": TERTIARY, "Other": PRIMARY},
     )
-    median_value = float(series.median()) if len(series) else 0
     fig.add_scatter(
         x=[chart_df["date"].min(), chart_df["date"].max()],
-        y=[median_value, median_value],
+        y=[data["median"], data["median"]],
         mode="lines",
         line=dict(color="#1a2416", width=2, dash="dot"),
         name="Median",
@@ -1934,19 +3391,18 @@ def render_activity_period_chart(all_data, start_date, end_date, chart_key):
     fig.update_layout(showlegend=True)
     fig.update_traces(marker_line_width=0)
     st.plotly_chart(style_news_fig(fig), width="stretch", config={"displayModeBar": False}, key=chart_key)
-    return True
 
 
-def render_species_recent_chart(all_data, start_date, end_date, species, chart_key):
-    all_news = prepare_news_df(all_data)
+def species_recent_chart_data(ctx, species):
+    all_news = ctx.all_news
     if len(all_news) == 0 or not species:
-        return False
+        return None
 
-    species_news = all_news[all_news["Com_Name"] == species].copy()
+    species_news = all_news[all_news["Com_Name"] == species]
     if len(species_news) == 0:
-        return False
+        return None
 
-    period_days = (end_date - start_date).days + 1
+    start_date, end_date, period_days = ctx.start_date, ctx.end_date, ctx.period_days
     chart_start = news_chart_start(all_news, end_date, period_days)
     chart_dates = pd.date_range(chart_start, end_date, freq="D").date
     species_counts = species_news.groupby("date").size().reindex(chart_dates, fill_value=0)
@@ -1955,13 +3411,16 @@ def render_species_recent_chart(all_data, start_date, end_date, species, chart_k
         lambda d: "Selected" if start_date <= d <= end_date else "Other"
     )
 
-    comparison = comparison_window(all_news, prepare_news_df(filter_date_window(all_data, start_date, end_date)), start_date, end_date)
-    expected_daily = None
-    comp_species = comparison[comparison["Com_Name"] == species].copy()
-    comp_days = comparison["date"].nunique()
-    if comp_days:
-        expected_daily = len(comp_species) / comp_days
+    expected = expected_count_for_period(ctx.baselines, ctx.current_news, start_date, end_date, species=species)
+    return {
+        "type": "species_recent",
+        "chart_df": chart_df,
+        "expected_daily": expected / period_days if expected is not None else None,
+    }
+
 
+def draw_species_recent_chart(data, chart_key):
+    chart_df = data["chart_df"]
     fig = px.bar(
         chart_df,
         x="date",
@@ -1971,6 +3430,7 @@ def render_species_recent_chart(all_data, start_date, end_date, species, chart_k
         labels={"date": "Date", "Detections": "Detections", "Selected": ""},
         color_discrete_map={"Selected": TERTIARY, "Other": SECONDARY},
     )
+    expected_daily = data["expected_daily"]
     if expected_daily is not None:
         fig.add_scatter(
             x=[chart_df["date"].min(), chart_df["date"].max()],
@@ -1982,34 +3442,23 @@ def render_species_recent_chart(all_data, start_date, end_date, species, chart_k
     fig.update_layout(showlegend=True)
     fig.update_traces(marker_line_width=0)
     st.plotly_chart(style_news_fig(fig), width="stretch", config={"displayModeBar": False}, key=chart_key)
-    return True
 
 
-def render_species_mix_period_chart(all_data, start_date, end_date, chart_key):
-    all_news = prepare_news_df(all_data)
+def species_mix_period_chart_data(ctx):
+    all_news = ctx.all_news
     if len(all_news) == 0:
-        return False
-
-    period_days = (end_date - start_date).days + 1
-    all_dates = pd.date_range(all_news["date"].min(), end_date, freq="D").date
-    species_by_date = all_news.groupby("date")["Com_Name"].apply(lambda x: set(x.dropna())).to_dict()
-    rolling_species = []
-    for idx, day in enumerate(all_dates):
-        if idx + 1 < period_days:
-            continue
-        window_species = set()
-        for window_day in all_dates[idx + 1 - period_days:idx + 1]:
-            window_species.update(species_by_date.get(window_day, set()))
-        rolling_species.append({"date": day, "Species": len(window_species)})
+        return None
 
-    chart_df = pd.DataFrame(rolling_species)
+    start_date, end_date, period_days = ctx.start_date, ctx.end_date, ctx.period_days
+    rolling_species = ctx.rolling_species[ctx.rolling_species.index <= end_date]
+    chart_df = rolling_species.rename("Species").rename_axis("date").reset_index()
     if len(chart_df) == 0:
-        return False
+        return None
 
     chart_start = news_chart_start(all_news, end_date, period_days)
     chart_df = chart_df[chart_df["date"] >= chart_start].copy()
     if len(chart_df) == 0:
-        return False
+        return None
 
     chart_df["Selected"] = chart_df["date"].apply(
         lambda d: "Selected" if start_date <= d <= end_date else "Other"
@@ -2017,20 +3466,28 @@ def render_species_mix_period_chart(all_data, start_date, end_date, chart_key):
     if period_days > 1:
         chart_df["Selected"] = chart_df["date"].apply(lambda d: "Selected" if d == end_date else "Other")
 
-    y_title = "Daily species" if period_days == 1 else f"{period_days}-day species"
+    return {
+        "type": "species_mix_period",
+        "chart_df": chart_df,
+        "y_title": "Daily species" if period_days == 1 else f"{period_days}-day species",
+        "median": float(chart_df["Species"].median()) if len(chart_df) else 0,
+    }
+
+
+def draw_species_mix_period_chart(data, chart_key):
+    chart_df = data["chart_df"]
     fig = px.bar(
         chart_df,
         x="date",
         y="Species",
         color="Selected",
         title="",
-        labels={"date": "Date", "Species": y_title, "Selected": ""},
+        labels={"date": "Date", "Species": data["y_title"], "Selected": ""},
         color_discrete_map={"Selected": TERTIARY, "Other": SECONDARY},
     )
-    median_value = float(chart_df["Species"].median()) if len(chart_df) else 0
     fig.add_scatter(
         x=[chart_df["date"].min(), chart_df["date"].max()],
-        y=[median_value, median_value],
+        y=[data["median"], data["median"]],
         mode="lines",
         line=dict(color="#1a2416", width=2, dash="dot"),
         name="Median",
@@ -2038,19 +3495,25 @@ def render_species_mix_period_chart(all_data, start_date, end_date, chart_key):
     fig.update_layout(showlegend=True)
     fig.update_traces(marker_line_width=0)
     st.plotly_chart(style_news_fig(fig), width="stretch", config={"displayModeBar": False}, key=chart_key)
-    return True
 
 
-def render_hourly_activity_chart(all_data, period_data, start_date, end_date, chart_key, highlight_hours=None):
-    all_news = prepare_news_df(all_data)
-    current_news = prepare_news_df(period_data)
-    if len(all_news) == 0 or len(current_news) == 0:
-        return False
+def hourly_activity_chart_data(ctx, highlight_hours=None):
+    if len(ctx.all_news) == 0 or len(ctx.current_news) == 0:
+        return None
 
-    period_days = (end_date - start_date).days + 1
+    period_days = ctx.period_days
+    comp = baseline_comparison(ctx.baselines, ctx.current_news, ctx.start_date, ctx.end_date)
+    return {
+        "type": "hourly_activity",
+        "current": ctx.hourly_counts,
+        "expected": comp["hours"] / comp["days"] * period_days if comp["days"] > 0 else None,
+        "highlight_hours": sorted(set(highlight_hours or [])),
+    }
+
+
+def draw_hourly_activity_chart(data, chart_key):
     hours = list(range(24))
-    current_counts = current_news.groupby("hour").size().reindex(hours, fill_value=0)
-    highlight_hours = set(highlight_hours or [])
+    highlight_hours = set(data["highlight_hours"])
     bar_colors = [TERTIARY if hour in highlight_hours else PRIMARY for hour in hours]
     hour_labels = [f"{hour:02d}:00" for hour in hours]
 
@@ -2058,21 +3521,17 @@ def render_hourly_activity_chart(all_data, period_data, start_date, end_date, ch
     fig.add_trace(
         go.Bar(
             x=hour_labels,
-            y=current_counts.values,
+            y=data["current"],
             name="Selected period",
             marker_color=bar_colors,
             opacity=0.78,
         )
     )
-
-    comp = comparison_window(all_news, current_news, start_date, end_date)
-    comp_days = comp["date"].nunique()
-    if comp_days:
-        expected_counts = comp.groupby("hour").size().reindex(hours, fill_value=0) / comp_days * period_days
+    if data["expected"] is not None:
         fig.add_trace(
             go.Scatter(
                 x=hour_labels,
-                y=expected_counts.values,
+                y=data["expected"],
                 name="Expected",
                 mode="lines+markers",
                 line=dict(color="#1a2416", width=2.5),
@@ -2087,16 +3546,15 @@ def render_hourly_activity_chart(all_data, period_data, start_date, end_date, ch
         yaxis_title="Detections",
     )
     st.plotly_chart(style_news_fig(fig), width="stretch", config={"displayModeBar": False}, key=chart_key)
-    return True
 
 
-def render_weather_activity_chart(period_data, weather_daily, weather_metric, chart_key):
+def weather_activity_chart_data(ctx, weather_daily, weather_metric):
     if weather_daily is None or len(weather_daily) == 0:
-        return False
+        return None
 
-    current_news = prepare_news_df(period_data)
+    current_news = ctx.current_news
     if len(current_news) == 0:
-        return False
+        return None
 
     daily_activity = (
         current_news.groupby("date")
@@ -2105,8 +3563,18 @@ def render_weather_activity_chart(period_data, weather_daily, weather_metric, ch
     )
     merged = daily_activity.merge(weather_daily, on="date", how="inner")
     if len(merged) == 0 or weather_metric not in merged.columns:
-        return False
+        return None
+
+    return {
+        "type": "weather_activity",
+        "merged": merged[["date", "detections", weather_metric]],
+        "weather_metric": weather_metric,
+    }
 
+
+def draw_weather_activity_chart(data, chart_key):
+    merged = data["merged"]
+    weather_metric = data["weather_metric"]
     metric_labels = {
         "precip_sum": ("Rainfall", "Rainfall (mm)", SECONDARY),
         "wind_max": ("Max wind", "Max wind (km/h)", "#607080"),
@@ -2143,7 +3611,15 @@ def render_weather_activity_chart(period_data, weather_daily, weather_metric, ch
     fig.update_yaxes(title_text="Detections", secondary_y=False)
     fig.update_yaxes(title_text=metric_label, secondary_y=True)
     st.plotly_chart(style_news_fig(fig), width="stretch", config={"displayModeBar": False}, key=chart_key)
-    return True
+
+
+NEWS_CHART_DRAWERS = {
+    "activity_period": draw_activity_period_chart,
+    "species_recent": draw_species_recent_chart,
+    "species_mix_period": draw_species_mix_period_chart,
+    "hourly_activity": draw_hourly_activity_chart,
+    "weather_activity": draw_weather_activity_chart,
+}
 
 
 def headline_chart_key(insight, start_date, end_date, index):
@@ -2160,33 +3636,48 @@ def headline_chart_key(insight, start_date, end_date, index):
     return f"headline_chart_{digest}"
 
 
-def render_news_chart(insight, all_data, period_data, start_date, end_date, weather_daily, chart_key):
+def news_chart_data(insight, ctx, weather_daily=None):
     chart = insight.get("chart")
     if not chart:
-        return False
+        return None
 
     chart_type = chart.get("type")
     if chart_type == "activity_period":
-        return render_activity_period_chart(all_data, start_date, end_date, chart_key)
+        return activity_period_chart_data(ctx)
     if chart_type == "species_recent":
-        return render_species_recent_chart(all_data, start_date, end_date, chart.get("species"), chart_key)
+        return species_recent_chart_data(ctx, chart.get("species"))
     if chart_type == "species_mix_period":
-        return render_species_mix_period_chart(all_data, start_date, end_date, chart_key)
+        return species_mix_period_chart_data(ctx)
     if chart_type == "hourly_activity":
-        return render_hourly_activity_chart(
-            all_data,
-            period_data,
-            start_date,
-            end_date,
-            chart_key,
-            chart.get("highlight_hours"),
-        )
+        return hourly_activity_chart_data(ctx, chart.get("highlight_hours"))
     if chart_type == "weather_activity":
-        return render_weather_activity_chart(period_data, weather_daily, chart.get("weather_metric"), chart_key)
-    return False
+        return weather_activity_chart_data(ctx, weather_daily, chart.get("weather_metric"))
+    return None
+
+
+def render_news_chart(insight, ctx, weather_daily, chart_key):
+    """Draw a headline chart, reusing series computed earlier this session.
+
+    Series are memoised in session state by dataset generation and chart key,
+    least recently used dropped first once NEWS_CHART_CACHE_SIZE is reached.
+    """
+    cache = st.session_state.setdefault("news_chart_cache", {})
+    memo_key = (ctx.generation, chart_key)
+    if memo_key in cache:
+        data = cache.pop(memo_key)
+    else:
+        data = news_chart_data(insight, ctx, weather_daily)
+    if data is None:
+        return False
+
+    cache[memo_key] = data
+    while len(cache) > NEWS_CHART_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    NEWS_CHART_DRAWERS[data["type"]](data, chart_key)
+    return True
 
 
-def render_news_insight(insight, all_data=None, period_data=None, start_date=None, end_date=None, weather_daily=None, index=0):
+def render_news_insight(insight, ctx=None, weather_daily=None, index=0):
     headline = html.escape(str(insight["headline"]))
     detail = html.escape(str(insight["detail"]))
     accent = NEWS_CATEGORY_COLORS.get(insight["category"], PRIMARY)
@@ -2199,9 +3690,86 @@ def render_news_insight(insight, all_data=None, period_data=None, start_date=Non
 """,
         unsafe_allow_html=True,
     )
-    if insight.get("chart") and all_data is not None and period_data is not None:
-        chart_key = headline_chart_key(insight, start_date, end_date, index)
-        render_news_chart(insight, all_data, period_data, start_date, end_date, weather_daily, chart_key)
+    if insight.get("chart") and ctx is not None:
+        chart_key = headline_chart_key(insight, ctx.start_date, ctx.end_date, index)
+        show_chart = st.toggle(
+            "Show chart",
+            value=index < NEWS_CHARTS_OPEN,
+            key=f"{chart_key}_show",
+        )
+        if show_chart:
+            render_news_chart(insight, ctx, weather_daily, chart_key)
+
+
+def render_hidden_headlines(insights):
+    if not insights:
+        return
+    with st.expander("Explore more headlines"):
+        insight_rows = [
+            {
+                "Headline": insight["headline"],
+                "Detail": insight["detail"],
+            }
+            for insight in insights
+        ]
+        st.dataframe(pd.DataFrame(insight_rows), hide_index=True, use_container_width=True)
+
+
+def render_news_profile(news_profile):
+    profile_df = pd.DataFrame(news_profile)
+    if len(profile_df):
+        st.caption(
+            f"Feed built in {profile_df['wall_ms'].sum():,.0f} ms "
+            f"across {int(profile_df['enabled'].sum())} generators."
+        )
+        st.dataframe(
+            profile_df.sort_values("wall_ms", ascending=False).rename(columns={
+                "generator": "Generator",
+                "category": "Category",
+                "needs": "Inputs",
+                "enabled": "Enabled",
+                "insights": "Headlines",
+                "rows_scanned": "Rows scanned",
+                "wall_ms": "Wall time (ms)",
+                "budget_ms": "Budget (ms)",
+                "over_budget": "Over budget",
+            }),
+            hide_index=True,
+            use_container_width=True,
+            column_config={"Wall time (ms)": st.column_config.NumberColumn(format="%.1f")},
+        )
+
+
+def render_weather_summary(weather_daily, start_date, end_date):
+    if weather_daily is None or len(weather_daily) == 0:
+        st.info("No weather summary is available for this period.")
+    elif start_date == end_date:
+        weather_match = weather_daily[weather_daily["date"] == end_date]
+        weather_daily_row = weather_match.iloc[0] if len(weather_match) else None
+        if weather_daily_row is None:
+            st.info("No weather summary is available for this day.")
+        else:
+            wx1, wx2, wx3 = st.columns(3)
+            wx1.metric("Max Temp", f"{weather_daily_row['temp_max']:.1f}°C")
+            wx2.metric("Min Temp", f"{weather_daily_row['temp_min']:.1f}°C")
+            wx3.metric("Rainfall", f"{weather_daily_row['precip_sum']:.1f} mm")
+            wx4, wx5 = st.columns(2)
+            wx4.metric("Max Wind", f"{weather_daily_row['wind_max']:.1f} km/h")
+            wx5.metric(
+                "Daylight",
+                (
+                    f"{weather_daily_row['sunrise'].strftime('%H:%M')} to "
+                    f"{weather_daily_row['sunset'].strftime('%H:%M')}"
+                ),
+            )
+    else:
+        wx1, wx2, wx3 = st.columns(3)
+        wx1.metric("Avg Max Temp", f"{weather_daily['temp_max'].mean():.1f}°C")
+        wx2.metric("Avg Min Temp", f"{weather_daily['temp_min'].mean():.1f}°C")
+        wx3.metric("Total Rainfall", f"{weather_daily['precip_sum'].sum():.1f} mm")
+        wx4, wx5 = st.columns(2)
+        wx4.metric("Peak Wind", f"{weather_daily['wind_max'].max():.1f} km/h")
+        wx5.metric("Weather Days", f"{len(weather_daily):,}")
 
 
 st.title("🐦 Garden Bird Dashboard")
@@ -2232,14 +3800,41 @@ page = st.sidebar.radio(
 )
 st.sidebar.divider()
 
-min_conf = st.sidebar.slider(
+stations = station_table(df, database_cache_signature(DB_PATH))
+selected_station = ALL_STATIONS
+if len(stations) > 1:
+    selected_station = st.sidebar.selectbox("Station", [ALL_STATIONS] + stations["Station"].tolist())
+station_df = df if selected_station == ALL_STATIONS else df[df["Station"] == selected_station]
+
+# Weather, sunrise and nearby sightings use the selected station's location,
+# or the busiest station with coordinates when all are shown.
+if selected_station == ALL_STATIONS:
+    _located_stations = stations.dropna(subset=["Lat", "Lon"])
+    _station_row = _located_stations.iloc[0] if len(_located_stations) else None
+else:
+    _station_row = stations.set_index("Station").loc[selected_station]
+station_lat = float(_station_row["Lat"]) if _station_row is not None else float("nan")
+station_lon = float(_station_row["Lon"]) if _station_row is not None else float("nan")
+station_located = pd.notna(station_lat) and pd.notna(station_lon)
+
+confidence_steps = confidence_rungs(float(df["Confidence"].min()), float(df["Confidence"].max()))
+min_conf = st.sidebar.select_slider(
     "Minimum Confidence",
-    float(df["Confidence"].min()),
-    float(df["Confidence"].max()),
-    float(df["Confidence"].min()),
+    options=confidence_steps,
+    value=confidence_steps[0],
+    format_func=lambda value: f"{value:.2f}",
 )
 
-filtered = df[df["Confidence"] >= min_conf].copy()
+count_mode = st.sidebar.radio(
+    "Count",
+    ["Detections", "Confidence-weighted"],
+    horizontal=True,
+    help="Confidence-weighted counts each detection by its confidence, so uncertain detections count for less.",
+)
+weighted = count_mode == "Confidence-weighted"
+count_label = "Weighted detections" if weighted else "Detections"
+
+filtered = station_df[station_df["Confidence"] >= min_conf].copy()
 
 species_list = st.sidebar.multiselect(
     "Select Species",
@@ -2279,15 +3874,8 @@ filtered = filtered[
     (filtered["timestamp"].dt.date <= end_date)
 ].copy()
 
-def season_from_month(m: int) -> str:
-    if m in (3, 4, 5):  return "Spring"
-    if m in (6, 7, 8):  return "Summer"
-    if m in (9, 10, 11): return "Autumn"
-    return "Winter"
-
 filtered["year"]      = filtered["timestamp"].dt.year.astype("Int64")
 filtered["month_num"] = filtered["timestamp"].dt.month.astype("Int64")
-filtered["season"]    = filtered["month_num"].apply(lambda m: season_from_month(m) if pd.notna(m) else None)
 
 # ── Year / Season / Month sidebar filters ──
 st.sidebar.subheader("Year / Season / Month")
@@ -2333,11 +3921,51 @@ review_df = filtered[filtered["UK_Status"] == "Review Recording"].copy()
 if exclude_review:
     filtered = filtered[~filtered["UK_Status"].isin(["Review Recording", "False Positive"])].copy()
 
+# The same filters over the precomputed confidence ladder; pages that only
+# need counts read this instead of re-aggregating the filtered rows.
+agg_view = filter_aggregate_table(
+    confidence_aggregate_table(station_df, (database_cache_signature(DB_PATH), selected_station), tuple(confidence_steps)),
+    confidence_steps.index(min_conf),
+    species=species_list,
+    statuses=status_list,
+    start_date=start_date,
+    end_date=end_date,
+    years=selected_years if year_mode == "Select years" else [],
+    season=selected_season,
+    month=month_num_by_name[chosen_month] if month_mode == "Choose month" and chosen_month else None,
+    exclude_review=exclude_review,
+)
+
 daily_base = filtered_pre_date.copy()
 if exclude_review:
     daily_base = daily_base[~daily_base["UK_Status"].isin(["Review Recording", "False Positive"])].copy()
 
 daily_base = daily_base.dropna(subset=["timestamp"]).copy()
+# Identifies the filtered history so derived stores (baselines and the like)
+# are rebuilt only when the database, the species metadata or a history-wide
+# filter changes.
+dataset_generation = (
+    database_cache_signature(DB_PATH),
+    metadata_signature(),
+    selected_station,
+    min_conf,
+    tuple(species_list),
+    tuple(status_list),
+    exclude_review,
+)
+# The same plus the date, year, season and month filters: identifies the
+# rows in `filtered` and `agg_view`.
+view_generation = dataset_generation + (
+    start_date,
+    end_date,
+    year_mode,
+    tuple(selected_years),
+    selected_season,
+    month_mode,
+    chosen_month,
+)
+if page != "NMDS":
+    release_standard_ordinations()
 daily_available_dates = sorted(daily_base["timestamp"].dt.date.unique().tolist())
 
 def default_daily_overview_date(available_dates):
@@ -2422,90 +4050,75 @@ if page == "Daily Overview":
         if len(daily_view) == 0:
             st.info("No detections were recorded for this period under the current filters.")
         else:
-            weather_daily = None
-            if {"Lat", "Lon"}.issubset(daily_view.columns) and daily_view["Lat"].notna().any() and daily_view["Lon"].notna().any():
-                w_lat = float(daily_view["Lat"].mode().iloc[0])
-                w_lon = float(daily_view["Lon"].mode().iloc[0])
-                _, weather_daily = fetch_weather(
-                    w_lat, w_lon,
+            # Weather loads on a worker thread while the rest of the page is
+            # built.
+            weather_future = None
+            if station_located:
+                weather_future = start_weather_fetch(
+                    station_lat, station_lon,
                     daily_window_start.strftime("%Y-%m-%d"),
                     daily_window_end.strftime("%Y-%m-%d"),
                 )
 
-            garden_events = load_garden_events()
-            news_insights = build_news_insights(
+            news_ctx = build_news_context(
                 daily_base,
                 daily_view,
                 daily_window_start,
                 daily_window_end,
-                garden_events,
-                weather_daily,
+                load_garden_events(),
+                dataset_generation,
+                location=(station_lat, station_lon),
+            )
+            news_disabled = set(st.session_state.get("news_disabled_generators", []))
+            news_profile = []
+            news_produced = run_news_generators(
+                news_generator_names(weather=False),
+                news_ctx,
+                disabled=news_disabled,
+                profile=news_profile,
             )
 
-            visible_news_insights = select_visible_news_insights(news_insights)
-            visible_news_keys = {insight_key(insight) for insight in visible_news_insights}
-            if visible_news_insights:
-                for insight_idx, insight in enumerate(visible_news_insights):
-                    render_news_insight(
-                        insight,
-                        daily_base,
-                        daily_view,
-                        daily_window_start,
-                        daily_window_end,
-                        weather_daily,
-                        index=insight_idx,
-                    )
-            else:
-                st.info("No major changes detected for this period.")
-
-            hidden_news_insights = [
-                insight for insight in news_insights
-                if insight_key(insight) not in visible_news_keys
-            ]
-            if hidden_news_insights:
-                with st.expander("Explore more headlines"):
-                    insight_rows = [
-                        {
-                            "Headline": insight["headline"],
-                            "Detail": insight["detail"],
-                        }
-                        for insight in hidden_news_insights
-                    ]
-                    st.dataframe(pd.DataFrame(insight_rows), hide_index=True, use_container_width=True)
+            # Headlines that don't need weather are drawn first, with their
+            # charts, along with the rest of the page; the weather headlines,
+            # the weather summary and the full feed tables fill in their
+            # placeholders once the fetch returns.
+            shown_insights = select_visible_news_insights(merge_news_insights(news_produced))
+            shown_keys = {insight_key(insight) for insight in shown_insights}
+            for insight_idx, insight in enumerate(shown_insights):
+                render_news_insight(insight, news_ctx, None, index=insight_idx)
+            weather_headline_slot = st.empty()
+            if weather_future is not None:
+                weather_headline_slot.caption("Loading weather…")
+
+            more_headlines_slot = st.empty()
+            with more_headlines_slot.container():
+                render_hidden_headlines([
+                    insight for insight in merge_news_insights(news_produced)
+                    if insight_key(insight) not in shown_keys
+                ])
+
+            if news_ctx.all_news["Station"].nunique() > 1:
+                with st.expander("Stations"):
+                    st.dataframe(station_period_summary(news_ctx), hide_index=True, use_container_width=True)
+
+            with st.expander("Headline engine profile"):
+                st.multiselect(
+                    "Disabled generators",
+                    list(NEWS_GENERATORS.keys()),
+                    key="news_disabled_generators",
+                    help="Skip these insight generators when building the feed.",
+                )
+                profile_slot = st.empty()
+                with profile_slot.container():
+                    render_news_profile(news_profile)
 
             st.divider()
             st.subheader("Drill-down")
 
             st.subheader("Weather Summary")
-            if weather_daily is None or len(weather_daily) == 0:
-                st.info("No weather summary is available for this period.")
-            elif daily_window_start == daily_window_end:
-                weather_match = weather_daily[weather_daily["date"] == daily_window_end]
-                weather_daily_row = weather_match.iloc[0] if len(weather_match) else None
-                if weather_daily_row is None:
-                    st.info("No weather summary is available for this day.")
-                else:
-                    wx1, wx2, wx3 = st.columns(3)
-                    wx1.metric("Max Temp", f"{weather_daily_row['temp_max']:.1f}°C")
-                    wx2.metric("Min Temp", f"{weather_daily_row['temp_min']:.1f}°C")
-                    wx3.metric("Rainfall", f"{weather_daily_row['precip_sum']:.1f} mm")
-                    wx4, wx5 = st.columns(2)
-                    wx4.metric("Max Wind", f"{weather_daily_row['wind_max']:.1f} km/h")
-                    wx5.metric(
-                        "Daylight",
-                        (
-                            f"{weather_daily_row['sunrise'].strftime('%H:%M')} to "
-                            f"{weather_daily_row['sunset'].strftime('%H:%M')}"
-                        ),
-                    )
-            else:
-                wx1, wx2, wx3 = st.columns(3)
-                wx1.metric("Avg Max Temp", f"{weather_daily['temp_max'].mean():.1f}°C")
-                wx2.metric("Avg Min Temp", f"{weather_daily['temp_min'].mean():.1f}°C")
-                wx3.metric("Total Rainfall", f"{weather_daily['precip_sum'].sum():.1f} mm")
-                wx4, wx5 = st.columns(2)
-                wx4.metric("Peak Wind", f"{weather_daily['wind_max'].max():.1f} km/h")
-                wx5.metric("Weather Days", f"{len(weather_daily):,}")
+            weather_summary_slot = st.empty()
+            if weather_future is not None:
+                weather_summary_slot.caption("Loading weather…")
 
             species_order = daily_view["Com_Name"].value_counts().index.tolist()
             species_color_map = {
@@ -2682,11 +4295,46 @@ if page == "Daily Overview":
             )
             st.plotly_chart(style_fig(fig), width="stretch")
 
+            weather_daily = weather_future.result()[1] if weather_future is not None else None
+            news_produced.update(run_news_generators(
+                news_generator_names(weather=True),
+                news_ctx,
+                weather_daily,
+                news_disabled,
+                news_profile,
+            ))
+            news_insights = merge_news_insights(news_produced)
+            weather_keys = {
+                insight_key(insight)
+                for name in news_generator_names(weather=True)
+                for insight in news_produced.get(name, [])
+            }
+            weather_insights = [
+                insight for insight in select_visible_news_insights(news_insights)
+                if insight_key(insight) in weather_keys and insight_key(insight) not in shown_keys
+            ]
+            with weather_headline_slot.container():
+                for insight_idx, insight in enumerate(weather_insights, start=len(shown_insights)):
+                    render_news_insight(insight, news_ctx, weather_daily, index=insight_idx)
+                if not shown_insights and not weather_insights:
+                    st.info("No major changes detected for this period.")
+
+            visible_news_keys = shown_keys | {insight_key(insight) for insight in weather_insights}
+            with more_headlines_slot.container():
+                render_hidden_headlines([
+                    insight for insight in news_insights
+                    if insight_key(insight) not in visible_news_keys
+                ])
+            with profile_slot.container():
+                render_news_profile(news_profile)
+            with weather_summary_slot.container():
+                render_weather_summary(weather_daily, daily_window_start, daily_window_end)
+
 # ── Overview ────────────────────────────────────────────────────────────────
 elif page == "Overview":
     top = (
-        filtered["Com_Name"].value_counts()
-        .head(20)
+        tally(agg_view, "Com_Name", weighted)
+        .nlargest(20)
         .reset_index()
     )
     top.columns = ["Species", "Count"]
@@ -2697,7 +4345,7 @@ elif page == "Overview":
         title="Top 20 Most Common Species",
         color="Count",
         color_continuous_scale=[[0, "#a3c47a"], [1, "#2d5233"]],
-        labels={"Count": "Detections", "Species": ""},
+        labels={"Count": count_label, "Species": ""},
     )
     fig.update_coloraxes(showscale=False)
     fig.update_traces(marker_line_width=0)
@@ -2802,21 +4450,20 @@ elif page == "Overview":
         horizontal=True, key="trends_metric",
     )
     _tm_species = trends_metric == "Unique Species"
-    _tm_ylabel = "Species" if _tm_species else "Detections"
+    _tm_ylabel = "Species" if _tm_species else count_label
 
     def _trend_agg(df, groupby_cols):
-        """Aggregate by size or nunique(Com_Name) based on metric toggle."""
+        """Aggregate by detections or nunique(Com_Name) based on metric toggle."""
         if _tm_species:
             return df.groupby(groupby_cols)["Com_Name"].nunique().reset_index(name="Count")
-        return df.groupby(groupby_cols).size().reset_index(name="Count")
+        return tally(df, groupby_cols, weighted).reset_index(name="Count")
 
     def _trend_title(base):
         suffix = " \u00b7 Unique Species" if _tm_species else ""
         return f"{base}{suffix}"
 
     # Yearly
-    yearly = filtered.dropna(subset=["timestamp"]).copy()
-    yearly = _trend_agg(yearly, "year")
+    yearly = _trend_agg(agg_view, "year")
     yearly["year"] = yearly["year"].astype(int)
     fig = px.area(
         yearly, x="year", y="Count",
@@ -2833,8 +4480,7 @@ elif page == "Overview":
     st.plotly_chart(style_fig(fig), width="stretch")
 
     # Monthly & Weekly — with optional year comparison
-    trends_df = filtered.dropna(subset=["timestamp"]).copy()
-    trends_df["year"] = trends_df["timestamp"].dt.year.astype(int)
+    trends_df = agg_view
     trends_years_avail = sorted(trends_df["year"].dropna().unique())
 
     trends_cmp = st.checkbox("Compare years", value=False, key="trends_cmp_years")
@@ -2883,7 +4529,7 @@ elif page == "Overview":
             st.plotly_chart(style_fig(fig), width="stretch")
     else:
         # Monthly — aggregated
-        monthly = _trend_agg(filtered, "month")
+        monthly = _trend_agg(agg_view, "month")
         fig = px.area(
             monthly, x="month", y="Count",
             title=_trend_title("Monthly Detection Trends"),
@@ -2904,7 +4550,7 @@ elif page == "Overview":
         st.plotly_chart(style_fig(fig), width="stretch")
 
         # Weekly — aggregated
-        weekly = _trend_agg(filtered, "week")
+        weekly = _trend_agg(agg_view, "week")
         fig = px.area(
             weekly, x="week", y="Count",
             title=_trend_title("Weekly Detection Trends"),
@@ -2927,9 +4573,9 @@ elif page == "Community":
             st.warning("No data for this selection.")
             return
         if by_species:
-            top_sp = data["Com_Name"].value_counts().head(20).index.tolist()
+            top_sp = tally(data, "Com_Name", weighted).nlargest(20).index.tolist()
             tod_df = data[data["Com_Name"].isin(top_sp)].copy()
-            sp_hour = tod_df.groupby(["hour", "Com_Name"]).size().reset_index(name="Count")
+            sp_hour = tally(tod_df, ["hour", "Com_Name"], weighted).reset_index(name="Count")
             sp_color_map = {
                 sp: NATURE_PALETTE[i % len(NATURE_PALETTE)]
                 for i, sp in enumerate(top_sp)
@@ -2938,13 +4584,13 @@ elif page == "Community":
                 sp_hour, x="hour", y="Count",
                 color="Com_Name",
                 title=title,
-                labels={"hour": "Hour of day", "Count": "Detections", "Com_Name": "Species"},
+                labels={"hour": "Hour of day", "Count": count_label, "Com_Name": "Species"},
                 category_orders={"Com_Name": top_sp},
                 color_discrete_map=sp_color_map,
             )
             fig.update_layout(xaxis=dict(dtick=1))
             fig.update_traces(marker_line_width=0)
-            hourly = data.groupby("hour").size().reset_index(name="Count")
+            hourly = tally(data, "hour", weighted).reset_index(name="Count")
             fig.add_scatter(
                 x=hourly["hour"], y=hourly["Count"],
                 mode="lines+markers",
@@ -2953,11 +4599,7 @@ elif page == "Community":
                 name="Total", showlegend=True,
             )
         elif by_status:
-            status_hour = (
-                data.groupby(["hour", "UK_Status"])
-                .size()
-                .reset_index(name="Count")
-            )
+            status_hour = tally(data, ["hour", "UK_Status"], weighted).reset_index(name="Count")
             cmap = status_color_map(status_hour["UK_Status"].unique())
             fig = px.line(
                 status_hour,
@@ -2965,17 +4607,17 @@ elif page == "Community":
                 color="UK_Status",
                 markers=True,
                 title=title,
-                labels={"hour": "Hour of day", "Count": "Detections", "UK_Status": "UK Status"},
+                labels={"hour": "Hour of day", "Count": count_label, "UK_Status": "UK Status"},
                 color_discrete_map=cmap,
             )
             fig.update_layout(xaxis=dict(dtick=1))
             fig.update_traces(line=dict(width=2), marker=dict(size=5))
         else:
-            hourly = data.groupby("hour").size().reset_index(name="Count")
+            hourly = tally(data, "hour", weighted).reset_index(name="Count")
             fig = px.area(
                 hourly, x="hour", y="Count",
                 title=title,
-                labels={"hour": "Hour of day", "Count": "Detections"},
+                labels={"hour": "Hour of day", "Count": count_label},
             )
             fig.update_traces(
                 line=dict(color=PRIMARY, width=2),
@@ -3070,11 +4712,7 @@ elif page == "Community":
     # ── Heatmap ──
     st.subheader("Activity Heatmap")
 
-    heatmap_data = (
-        filtered.groupby(["month", "hour"])
-        .size()
-        .reset_index(name="Count")
-    )
+    heatmap_data = tally(agg_view, ["month", "hour"], weighted).reset_index(name="Count")
     # Pivot to a full 12×24 grid so every month gets its own row
     heatmap_pivot = heatmap_data.pivot(index="month", columns="hour", values="Count").fillna(0)
     heatmap_pivot = heatmap_pivot.reindex(index=range(1, 13), columns=range(24), fill_value=0)
@@ -3085,14 +4723,14 @@ elif page == "Community":
         y=list(MONTH_LABELS.values()),
         title="Activity Heatmap · Hour vs Month",
         color_continuous_scale=HEATMAP_SCALE,
-        labels={"x": "Hour of day", "y": "Month", "color": "Detections"},
+        labels={"x": "Hour of day", "y": "Month", "color": count_label},
         aspect="auto",
     )
     fig.update_layout(
         xaxis=dict(dtick=1),
         yaxis=dict(dtick=1),
         coloraxis_colorbar=dict(
-            title="Detections",
+            title=count_label,
             tickfont=dict(size=11, color="#4a5c44"),
             title_font=dict(size=12, color="#4a5c44"),
             thickness=14,
@@ -3147,14 +4785,10 @@ elif page == "Community":
             st.warning("No data for this selection.")
             return
 
-        top_species = df_in["Com_Name"].value_counts().head(20).index.tolist()
+        top_species = tally(df_in, "Com_Name", weighted).nlargest(20).index.tolist()
         df_in = df_in[df_in["Com_Name"].isin(top_species)].copy()
 
-        comp_hour = (
-            df_in.groupby(["hour", "Com_Name"])
-            .size()
-            .reset_index(name="Count")
-        )
+        comp_hour = tally(df_in, ["hour", "Com_Name"], weighted).reset_index(name="Count")
         comp_hour["Percent"] = (
             comp_hour.groupby("hour")["Count"]
             .transform(lambda x: (x / x.sum()) * 100)
@@ -3248,11 +4882,7 @@ elif page == "Community":
     if comp_mode == "UK Status":
         comp_col = "UK_Status"
         comp_label = "UK Status"
-        comp_month = (
-            tmp.groupby(["month", comp_col])
-            .size()
-            .reset_index(name="Count")
-        )
+        comp_month = tally(tmp, ["month", comp_col], weighted).reset_index(name="Count")
         comp_month["Percent"] = (
             comp_month.groupby("month")["Count"]
             .transform(lambda x: (x / x.sum()) * 100)
@@ -3269,11 +4899,7 @@ elif page == "Community":
     else:
         comp_col = "Diet"
         comp_label = "Diet"
-        comp_month = (
-            tmp.groupby(["month", comp_col])
-            .size()
-            .reset_index(name="Count")
-        )
+        comp_month = tally(tmp, ["month", comp_col], weighted).reset_index(name="Count")
         comp_month["Percent"] = (
             comp_month.groupby("month")["Count"]
             .transform(lambda x: (x / x.sum()) * 100)
@@ -3300,48 +4926,33 @@ elif page == "Community":
     # ── Species Co-occurrence ──
     st.subheader("Species Co-occurrence")
 
-    co_topn = st.slider("Top N species", 5, 20, 15, key="co_topn")
-    co_unit = st.radio("Co-occurrence unit", ["Day", "Hour"], horizontal=True, key="co_unit")
+    co_c1, co_c2, co_c3 = st.columns(3)
+    with co_c1:
+        co_topn = st.slider("Top N species", 5, 50, 15, key="co_topn")
+    with co_c2:
+        co_unit = st.radio("Co-occurrence unit", ["Day", "Hour"], horizontal=True, key="co_unit")
+    with co_c3:
+        co_norm = st.radio("Normalisation", COOCCURRENCE_NORMALISATIONS, horizontal=True, key="co_norm")
 
-    co_df = filtered.dropna(subset=["timestamp"]).copy()
-
-    if len(co_df) == 0:
+    if len(filtered) == 0:
         st.info("No data available for co-occurrence analysis.")
     else:
-        top_co = co_df["Com_Name"].value_counts().head(co_topn).index.tolist()
-        co_df = co_df[co_df["Com_Name"].isin(top_co)].copy()
-
-        if co_unit == "Day":
-            co_df["unit"] = co_df["timestamp"].dt.date.astype(str)
-        else:
-            co_df["unit"] = co_df["timestamp"].dt.strftime("%Y-%m-%d-%H")
-
-        presence = co_df.groupby(["unit", "Com_Name"]).size().unstack(fill_value=0)
-        presence = (presence > 0).astype(int)
-        # Ensure all top species are columns
-        for sp in top_co:
-            if sp not in presence.columns:
-                presence[sp] = 0
-        presence = presence[top_co]
-
-        dot = presence.T.values @ presence.values  # species x species
-        counts = presence.sum(axis=0).values
-        min_counts = np.minimum(counts[:, None], counts[None, :])
-        min_counts[min_counts == 0] = 1  # avoid division by zero
-        norm_co = dot / min_counts
-        np.fill_diagonal(norm_co, 0)
+        co_engine = cooccurrence_engine(filtered, view_generation, co_unit, weighted)
+        top_co = co_engine["species"][:co_topn].tolist()
+        norm_co = cooccurrence_scores(co_engine, co_norm, co_topn)
 
         fig = px.imshow(
             norm_co,
             x=top_co, y=top_co,
-            title=f"Species Co-occurrence (normalised, by {co_unit.lower()})",
+            title=f"Species Co-occurrence ({co_norm}, by {co_unit.lower()})",
             color_continuous_scale=HEATMAP_SCALE,
-            labels={"color": "Co-occurrence"},
+            labels={"color": co_norm},
             aspect="auto",
         )
         fig.update_layout(
+            height=max(450, len(top_co) * 18),
             coloraxis_colorbar=dict(
-                title="Co-occurrence",
+                title=co_norm,
                 tickfont=dict(size=11, color="#4a5c44"),
                 title_font=dict(size=12, color="#4a5c44"),
                 thickness=14,
@@ -3349,18 +4960,87 @@ elif page == "Community":
         )
         st.plotly_chart(style_fig(fig), width="stretch")
 
+        co_test = st.checkbox("Test against a shuffled null", value=False, key="co_test")
+        if co_test:
+            co_stratum = "day" if co_unit == "Hour" else "month"
+            st.caption(
+                f"Each species' {co_unit.lower()}s are rotated at random within each {co_stratum}, "
+                f"keeping how often it was present, and every pair recounted "
+                f"{COOCCURRENCE_PERMUTATIONS} times. Positive z means together more often than chance."
+            )
+            co_null = cooccurrence_null(co_engine, view_generation, co_unit, weighted, co_topn)
+
+            fig = px.imshow(
+                co_null["z"],
+                x=top_co, y=top_co,
+                title=f"Co-occurrence vs Shuffled Null (z-score, by {co_unit.lower()})",
+                color_continuous_scale=[[0, SECONDARY], [0.5, "#f5f3ee"], [1, PRIMARY]],
+                color_continuous_midpoint=0,
+                labels={"color": "z"},
+                aspect="auto",
+            )
+            fig.update_layout(height=max(450, len(top_co) * 18))
+            st.plotly_chart(style_fig(fig), width="stretch")
+
+            pair_i, pair_j = np.triu_indices(len(top_co), k=1)
+            co_pairs = pd.DataFrame({
+                "Species A": np.asarray(top_co)[pair_i],
+                "Species B": np.asarray(top_co)[pair_j],
+                "Together": co_engine["co"][pair_i, pair_j].round(1),
+                "Expected": co_null["expected"][pair_i, pair_j].round(1),
+                "z": co_null["z"][pair_i, pair_j].round(2),
+                "p": co_null["p"][pair_i, pair_j].round(3),
+            })
+            co_pairs = co_pairs[co_pairs["p"] < 0.05]
+            co_pairs = co_pairs.reindex(co_pairs["z"].abs().sort_values(ascending=False).index)
+            if len(co_pairs):
+                st.dataframe(co_pairs, hide_index=True)
+            else:
+                st.info("No pair differs from chance at p < 0.05.")
+
+    st.divider()
+
+    # ── Time-Lagged Co-occurrence ──
+    st.subheader("Time-Lagged Co-occurrence")
+    st.caption("How often a detection of one species (row) is followed by another species (column) within the lag.")
+
+    lag_c1, lag_c2 = st.columns(2)
+    with lag_c1:
+        lag_minutes = st.slider("Lag (minutes)", 1, 120, 10, key="lag_minutes")
+    with lag_c2:
+        lag_topn = st.slider("Top N species", 5, 30, 12, key="lag_topn")
+
+    if len(filtered) == 0:
+        st.info("No data available for time-lagged co-occurrence.")
+    else:
+        lag_index = species_time_index(filtered, view_generation)
+        lag_species = lag_index["species"][:lag_topn].tolist()
+        lag_followed, lag_totals = lagged_cooccurrence(lag_index, lag_minutes, lag_topn)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            lag_share = np.where(lag_totals[:, None] > 0, lag_followed / lag_totals[:, None] * 100, 0.0)
+        np.fill_diagonal(lag_share, np.nan)
+
+        fig = px.imshow(
+            lag_share,
+            x=lag_species, y=lag_species,
+            title=f"Followed Within {lag_minutes} min (% of row species' detections)",
+            color_continuous_scale=HEATMAP_SCALE,
+            labels={"x": "Then", "y": "First", "color": "%"},
+            aspect="auto",
+        )
+        fig.update_layout(height=max(450, len(lag_species) * 22))
+        st.plotly_chart(style_fig(fig), width="stretch")
+
     st.divider()
 
     # ── Diversity Indices ──
     st.subheader("Diversity Indices")
 
-    div_df = filtered.dropna(subset=["timestamp"]).copy()
-    div_df["year"] = div_df["timestamp"].dt.year.astype(int)
-    div_years_avail = sorted(div_df["year"].dropna().unique())
+    div_years_avail = sorted(agg_view["year"].unique())
 
     div_cmp = st.checkbox("Compare years", value=False, key="div_cmp_years")
 
-    if len(div_df) == 0:
+    if len(agg_view) == 0:
         st.info("No data available for diversity index computation.")
     elif div_cmp and len(div_years_avail) >= 2:
         default_div_yrs = div_years_avail[-2:] if len(div_years_avail) >= 2 else div_years_avail
@@ -3371,26 +5051,16 @@ elif page == "Community":
         if not div_years:
             st.info("Select at least one year.")
         else:
-            d_df = div_df[div_df["year"].isin(div_years)].copy()
-
-            # Compute indices per year × month
-            div_rows = []
-            for yr in sorted(div_years):
-                for m in range(1, 13):
-                    p_df = d_df[(d_df["year"] == yr) & (d_df["month"] == m)]
-                    counts = p_df["Com_Name"].value_counts().values
-                    total = counts.sum()
-                    richness = len(counts)
-                    if total > 0 and richness > 0:
-                        proportions = counts / total
-                        shannon = -np.sum(proportions * np.log(proportions))
-                        simpson = 1 - np.sum(proportions ** 2)
-                    else:
-                        shannon = 0.0
-                        simpson = 0.0
-                    div_rows.append({"Year": str(yr), "month": m, "Shannon_H": shannon,
-                                     "Simpson_1D": simpson, "Unique_Species": richness})
-            div_result = pd.DataFrame(div_rows)
+            # Indices per year × month, from the monthly table
+            monthly_div = diversity_table(agg_view, view_generation, "Month", weighted)
+            monthly_div["Year"] = monthly_div["Period"].str[:4]
+            monthly_div["month"] = monthly_div["Period"].str[5:7].astype(int)
+            div_result = (
+                pd.MultiIndex.from_product([[str(yr) for yr in sorted(div_years)], range(1, 13)], names=["Year", "month"])
+                .to_frame(index=False)
+                .merge(monthly_div.drop(columns="Period"), on=["Year", "month"], how="left")
+                .fillna({"Shannon_H": 0.0, "Simpson_1D": 0.0, "Unique_Species": 0})
+            )
 
             _month_tick = dict(dtick=1, tickmode="array",
                                tickvals=list(MONTH_LABELS.keys()),
@@ -3429,32 +5099,8 @@ elif page == "Community":
             fig_r.update_layout(xaxis=_month_tick)
             st.plotly_chart(style_fig(fig_r), width="stretch")
     else:
-        div_res = st.radio("Time resolution", ["Month", "Week"], horizontal=True, key="div_res")
-
-        if div_res == "Month":
-            div_df["period"] = div_df["timestamp"].dt.to_period("M").astype(str)
-        else:
-            div_df["period"] = (
-                div_df["timestamp"].dt.isocalendar().year.astype(str) + "-W"
-                + div_df["timestamp"].dt.isocalendar().week.astype(str).str.zfill(2)
-            )
-
-        periods = sorted(div_df["period"].unique())
-        div_rows = []
-        for p in periods:
-            p_df = div_df[div_df["period"] == p]
-            counts = p_df["Com_Name"].value_counts().values
-            total = counts.sum()
-            richness = len(counts)
-            if total > 0 and richness > 0:
-                proportions = counts / total
-                shannon = -np.sum(proportions * np.log(proportions))
-                simpson = 1 - np.sum(proportions ** 2)
-            else:
-                shannon = 0.0
-                simpson = 0.0
-            div_rows.append({"Period": p, "Shannon_H": shannon, "Simpson_1D": simpson, "Unique_Species": richness})
-        div_result = pd.DataFrame(div_rows)
+        div_res = st.radio("Time resolution", DIVERSITY_RESOLUTIONS, horizontal=True, key="div_res")
+        div_result = diversity_table(agg_view, view_generation, div_res, weighted)
 
         fig_h = px.line(
             div_result, x="Period", y="Shannon_H",
@@ -3476,24 +5122,109 @@ elif page == "Community":
 
         fig_r = px.line(
             div_result, x="Period", y="Unique_Species",
-            title="Unique Species per Month",
+            title=f"Unique Species per {div_res}",
             labels={"Period": div_res, "Unique_Species": "Unique species"},
             markers=True,
         )
         fig_r.update_traces(line=dict(color=TERTIARY, width=2), marker=dict(size=5, color=TERTIARY))
         st.plotly_chart(style_fig(fig_r), width="stretch")
 
+    st.divider()
+
+    # ── Hill Numbers & Rarefaction ──
+    st.subheader("Hill Numbers & Rarefaction")
+    st.caption(
+        "Effective number of species: q=0 counts every species, q=1 weighs them by "
+        "abundance (exp Shannon), q=2 counts only the dominant ones (inverse Simpson). "
+        "Bands are 95% bootstrap intervals."
+    )
+
+    hill_res = st.radio("Time resolution", ["Month", "Week"], horizontal=True, key="hill_res")
+
+    if len(agg_view) == 0:
+        st.info("No data available for diversity curves.")
+    else:
+        hill_result, hill_depth = hill_diversity_table(agg_view, view_generation, hill_res)
+
+        fig = go.Figure()
+        for q, (q_label, q_color) in enumerate([
+            ("q=0 (richness)", PRIMARY),
+            ("q=1 (exp Shannon)", SECONDARY),
+            ("q=2 (inverse Simpson)", TERTIARY),
+        ]):
+            fig.add_scatter(
+                x=list(hill_result["Period"]) + list(hill_result["Period"])[::-1],
+                y=list(hill_result[f"q{q}_hi"]) + list(hill_result[f"q{q}_lo"])[::-1],
+                fill="toself",
+                fillcolor=f"rgba({_hex_to_rgb(q_color)}, 0.15)",
+                line=dict(width=0),
+                hoverinfo="skip",
+                showlegend=False,
+            )
+            fig.add_scatter(
+                x=hill_result["Period"], y=hill_result[f"q{q}"],
+                mode="lines+markers",
+                line=dict(color=q_color, width=2),
+                marker=dict(size=4, color=q_color),
+                name=q_label,
+            )
+        fig.update_layout(
+            title="Hill Numbers",
+            xaxis_title=hill_res,
+            yaxis_title="Effective species",
+        )
+        st.plotly_chart(style_fig(fig), width="stretch")
+
+        if hill_depth:
+            fig = go.Figure()
+            fig.add_scatter(
+                x=hill_result["Period"], y=hill_result["q0"],
+                mode="lines+markers",
+                line=dict(color=PRIMARY, width=2),
+                marker=dict(size=4, color=PRIMARY),
+                name="Observed",
+            )
+            fig.add_scatter(
+                x=hill_result["Period"], y=hill_result["Rarefied"],
+                mode="lines+markers",
+                line=dict(color=TERTIARY, width=2, dash="dash"),
+                marker=dict(size=4, color=TERTIARY),
+                name=f"Rarefied to {hill_depth:,} detections",
+            )
+            fig.update_layout(
+                title="Observed vs Rarefied Richness",
+                xaxis_title=hill_res,
+                yaxis_title="Species",
+            )
+            st.plotly_chart(style_fig(fig), width="stretch")
+            st.caption(
+                f"Rarefied richness is the expected number of species in {hill_depth:,} random "
+                f"detections, so busy and quiet periods compare fairly. Periods with fewer than "
+                f"{RAREFACTION_MIN_DETECTIONS} detections are left out."
+            )
+        else:
+            st.info(f"No period has {RAREFACTION_MIN_DETECTIONS} detections to rarefy.")
+
 # ── NMDS ──────────────────────────────────────────────────────────────────
 elif page == "NMDS":
     st.subheader("NMDS Ordination")
+    standard_ordinations = queue_standard_ordinations(
+        filtered[["Com_Name", "timestamp", "month", "time_bucket", "season"]], view_generation,
+    )
 
-    nmds_c1, nmds_c2, nmds_c3 = st.columns(3)
+    nmds_c1, nmds_c5, nmds_c2, nmds_c3, nmds_c4 = st.columns(5)
     with nmds_c1:
         nmds_matrix = st.selectbox(
             "Feature matrix",
-            ["Species × Peak Activity Time", "Species × Month", "Species × Season"],
+            NMDS_MATRICES,
             key="nmds_matrix",
         )
+    with nmds_c5:
+        ord_method = st.selectbox(
+            "Method", list(ORDINATION_METHODS), key="ord_method",
+            help="NMDS preserves the rank order of dissimilarities; PCoA is a single "
+                 "eigendecomposition; t-SNE preserves local neighbourhoods.",
+        )
     with nmds_c2:
         nmds_colour = st.selectbox(
             "Colour by",
@@ -3502,82 +5233,85 @@ elif page == "NMDS":
         )
     with nmds_c3:
         nmds_min_det = st.slider(
-            "Minimum detections per species", 1, 100, 5, key="nmds_min_det",
+            "Minimum detections per species", 1, 100, NMDS_DEFAULT_MIN_DETECTIONS, key="nmds_min_det",
+        )
+    with nmds_c4:
+        nmds_mode = st.radio(
+            "Fit", list(NMDS_MODES), horizontal=True, key="nmds_mode",
+            help="Fast uses one start and stops early; Accurate uses ten random starts. "
+                 "PCoA has a single exact fit.",
         )
 
-    # Filter to species with enough detections
-    nmds_det_counts = filtered["Com_Name"].value_counts()
-    nmds_valid_species = nmds_det_counts[nmds_det_counts >= nmds_min_det].index.tolist()
-    nmds_df = filtered[filtered["Com_Name"].isin(nmds_valid_species)].copy()
+    nmds_pivot = nmds_feature_matrix(filtered, nmds_matrix, nmds_min_det)
 
-    if len(nmds_valid_species) < 5:
+    if nmds_pivot is None:
+        nmds_det_counts = filtered["Com_Name"].value_counts()
         st.warning(
-            f"Only {len(nmds_valid_species)} species meet the minimum detection threshold. "
-            "At least 5 are needed for NMDS. Try lowering the threshold or broadening filters."
+            f"Only {int((nmds_det_counts >= nmds_min_det).sum())} species meet the minimum detection threshold. "
+            f"At least {NMDS_MIN_SPECIES} are needed for NMDS. Try lowering the threshold or broadening filters."
         )
     else:
-        nmds_ts = nmds_df.dropna(subset=["timestamp"]).copy()
-
-        # Build pivot table based on chosen matrix
-        _season_map = {1: "Winter", 2: "Winter", 3: "Spring", 4: "Spring", 5: "Spring",
-                       6: "Summer", 7: "Summer", 8: "Summer", 9: "Autumn", 10: "Autumn",
-                       11: "Autumn", 12: "Winter"}
-        if nmds_matrix == "Species × Peak Activity Time":
-            nmds_ts["_unit"] = nmds_ts["hour"].apply(assign_time_bucket)
-            all_cols = list(TIME_BUCKET_COLORS.keys())
-        elif nmds_matrix == "Species × Month":
-            nmds_ts["_unit"] = nmds_ts["month"].map(MONTH_LABELS)
-            all_cols = list(MONTH_LABELS.values())
-        else:  # Species × Season
-            nmds_ts["_unit"] = nmds_ts["month"].map(_season_map)
-            all_cols = list(SEASON_COLORS.keys())
-
-        nmds_pivot = nmds_ts.pivot_table(
-            index="Com_Name", columns="_unit", values="timestamp",
-            aggfunc="count", fill_value=0,
-        )
-        # Ensure all columns present
-        for c in all_cols:
-            if c not in nmds_pivot.columns:
-                nmds_pivot[c] = 0
-        nmds_pivot = nmds_pivot[all_cols]
-
         # Normalise rows to proportions
-        row_sums = nmds_pivot.sum(axis=1).replace(0, 1)
-        nmds_norm = nmds_pivot.div(row_sums, axis=0)
-
-        species_list = nmds_norm.index.tolist()
-        coords, stress = compute_nmds(nmds_norm.values, tuple(species_list))
+        nmds_values = nmds_feature_values(nmds_pivot)
+        species_list = nmds_pivot.index.tolist()
+
+        # Reuse the last fit for an unchanged matrix; take the standard fits
+        # from the background worker; otherwise start NMDS from the previous
+        # layout of the same matrix type when the species overlap.
+        nmds_digest = feature_digest(nmds_values)
+        nmds_warm = st.session_state.setdefault("nmds_warm_start", {})
+        nmds_last = nmds_warm.get((nmds_matrix, ord_method))
+        coords = stress = ord_seconds = None
+        if nmds_last and nmds_last["digest"] == nmds_digest and nmds_last["mode"] == nmds_mode:
+            coords, stress, ord_seconds = nmds_last["coords"], nmds_last["stress"], nmds_last["seconds"]
+        elif ord_method != "NMDS":
+            coords, stress, ord_seconds = compute_ordination(nmds_values, tuple(species_list), ord_method, nmds_mode)
+        elif nmds_mode == "Accurate" and nmds_min_det == NMDS_DEFAULT_MIN_DETECTIONS:
+            with st.spinner("Finishing ordination…"):
+                nmds_job = standard_ordinations[nmds_matrix]
+                nmds_ready = nmds_job.result() if nmds_job.exception() is None else None
+            if nmds_ready and nmds_ready["species"] == species_list:
+                coords, stress, ord_seconds = nmds_ready["coords"], nmds_ready["stress"], nmds_ready["seconds"]
+            else:
+                coords, stress, ord_seconds = compute_ordination(nmds_values, tuple(species_list), "NMDS", nmds_mode)
+        elif nmds_mode == "Fast" or st.button("Fit NMDS"):
+            nmds_init = warm_start_coords(
+                species_list,
+                nmds_last["positions"] if nmds_last else None,
+                braycurtis_distances(nmds_digest, nmds_values),
+            )
+            coords, stress, ord_seconds = compute_ordination(
+                nmds_values, tuple(species_list), "NMDS", nmds_mode, nmds_init,
+            )
+        else:
+            st.info(
+                f"Accurate fits for non-default thresholds are run on request ({len(species_list)} species). "
+                "Switch to Fast for an immediate layout."
+            )
 
-        # Build result DataFrame with metadata
-        nmds_result = pd.DataFrame({
-            "Species": species_list,
-            "NMDS1": coords[:, 0],
-            "NMDS2": coords[:, 1],
-        })
+        # The layout (metadata and hulls) is kept with the fit and rebuilt
+        # only when the fit, the underlying rows or the species' status and
+        # diet labels change.
+        if coords is not None:
+            if not nmds_last or nmds_last["digest"] != nmds_digest or nmds_last["mode"] != nmds_mode:
+                nmds_last = nmds_warm[(nmds_matrix, ord_method)] = {
+                    "digest": nmds_digest,
+                    "mode": nmds_mode,
+                    "coords": coords,
+                    "stress": stress,
+                    "seconds": ord_seconds,
+                    "positions": dict(zip(species_list, map(tuple, coords))),
+                    "view": None,
+                }
+            nmds_view = (view_generation, metadata_signature(), nmds_min_det)
+            if nmds_last["view"] != nmds_view:
+                nmds_df = filtered[filtered["Com_Name"].isin(nmds_pivot.index)]
+                nmds_last["layout"] = ordination_layout(nmds_df, nmds_pivot, coords)
+                nmds_last["view"] = nmds_view
+            nmds_layout = nmds_last["layout"]
 
-        # Add metadata per species
-        sp_meta = nmds_df.groupby("Com_Name").agg(
-            Diet=("Diet", lambda x: x.mode().iloc[0] if len(x.mode()) else "Unclassified"),
-            UK_Status=("UK_Status", lambda x: x.mode().iloc[0] if len(x.mode()) else "Unknown"),
-            Detections=("Com_Name", "count"),
-        ).reset_index().rename(columns={"Com_Name": "Species"})
-
-        # Dominant time bucket
-        nmds_ts["_tb"] = nmds_ts["hour"].apply(assign_time_bucket)
-        tb_counts = nmds_ts.groupby(["Com_Name", "_tb"]).size().reset_index(name="n")
-        dom_tb = tb_counts.loc[tb_counts.groupby("Com_Name")["n"].idxmax()][["Com_Name", "_tb"]]
-        dom_tb.columns = ["Species", "Dominant_Time_Bucket"]
-
-        # Peak season
-        nmds_ts["_season"] = nmds_ts["month"].map(_season_map)
-        season_counts = nmds_ts.groupby(["Com_Name", "_season"]).size().reset_index(name="n")
-        peak_season = season_counts.loc[season_counts.groupby("Com_Name")["n"].idxmax()][["Com_Name", "_season"]]
-        peak_season.columns = ["Species", "Peak_Season"]
-
-        nmds_result = nmds_result.merge(sp_meta, on="Species", how="left")
-        nmds_result = nmds_result.merge(dom_tb, on="Species", how="left")
-        nmds_result = nmds_result.merge(peak_season, on="Species", how="left")
+    if nmds_pivot is not None and coords is not None:
+        nmds_result = nmds_layout["points"]
 
         # Select colour column and colour map
         if nmds_colour == "Diet":
@@ -3608,52 +5342,28 @@ elif page == "NMDS":
                 "NMDS1": ":.3f",
                 "NMDS2": ":.3f",
             },
-            title="NMDS — Species Similarity Ordination",
+            labels={"NMDS1": f"{ord_method} 1", "NMDS2": f"{ord_method} 2"},
+            title=f"{ord_method} — Species Similarity Ordination",
         )
         fig_nmds.update_traces(marker=dict(size=10, line=dict(width=1, color="rgba(26,36,22,0.3)")))
 
         # Draw convex hulls grouped by the dominant feature-matrix category
         # (i.e. which column of the matrix each species peaks in)
-        from scipy.spatial import ConvexHull
-
-        # Determine each species' dominant matrix column
-        _dominant = nmds_pivot.idxmax(axis=1)  # Series: Com_Name -> column label
-        _dominant.name = "_dominant_matrix_cat"
-        nmds_result = nmds_result.merge(
-            _dominant.reset_index().rename(columns={"Com_Name": "Species"}),
-            on="Species", how="left",
-        )
-
-        # Pick hull colours and legend title based on the matrix type
         if nmds_matrix == "Species × Peak Activity Time":
             _hull_colors = TIME_BUCKET_COLORS
             _hull_title = "Peak activity time"
         elif nmds_matrix == "Species × Season":
             _hull_colors = SEASON_COLORS
             _hull_title = "Peak season"
-        elif nmds_matrix == "Species × Month":
-            # Generate month colours from the heatmap scale
-            _month_greens = [
-                "#c8dfa0", "#aed48a", "#94c974", "#7aaa6a", "#6b9e5e",
-                "#5c8c5c", "#4d7a4d", "#3e683e", "#2d5233", "#3e683e",
-                "#5c8c5c", "#94c974",
-            ]
-            _hull_colors = {m: _month_greens[i] for i, m in enumerate(MONTH_LABELS.values())}
+        else:  # Species × Month
+            _hull_colors = NMDS_MONTH_HULL_COLORS
             _hull_title = "Peak month"
 
         _hull_group_title = _hull_title
-        for group_name, grp in nmds_result.groupby("_dominant_matrix_cat"):
-            if len(grp) < 3:
-                continue
-            pts = grp[["NMDS1", "NMDS2"]].values
-            try:
-                hull = ConvexHull(pts)
-            except Exception:
-                continue
-            hull_idx = list(hull.vertices) + [hull.vertices[0]]
+        for group_name, hull_x, hull_y in nmds_layout["hulls"]:
             base_color = _hull_colors.get(group_name, "#8c9c8c")
             fig_nmds.add_trace(go.Scatter(
-                x=pts[hull_idx, 0], y=pts[hull_idx, 1],
+                x=hull_x, y=hull_y,
                 mode="lines",
                 fill="toself",
                 fillcolor=f"rgba({_hex_to_rgb(base_color)}, 0.10)",
@@ -3686,6 +5396,27 @@ elif page == "NMDS":
             "Excellent < 0.05, Good < 0.1, Fair < 0.2, Poor ≥ 0.2."
         )
 
+        if st.checkbox("Compare methods", value=False, key="ord_compare"):
+            ord_rows = []
+            for method in ORDINATION_METHODS:
+                method_last = nmds_warm.get((nmds_matrix, method))
+                if method_last and method_last["digest"] == nmds_digest and method_last["mode"] == nmds_mode:
+                    method_stress, method_seconds = method_last["stress"], method_last["seconds"]
+                else:
+                    _, method_stress, method_seconds = compute_ordination(
+                        nmds_values, tuple(species_list), method, nmds_mode,
+                    )
+                ord_rows.append({
+                    "Method": method,
+                    "Fit time (s)": round(method_seconds, 3),
+                    "Stress": round(method_stress, 4),
+                })
+            st.dataframe(pd.DataFrame(ord_rows), hide_index=True)
+            st.caption(
+                f"Each method fitted once ({nmds_mode.lower()} settings) to the same Bray–Curtis "
+                "distance matrix, which is computed once and shared. Times are from the first fit."
+            )
+
 # ── Dawn Chorus Overview ──────────────────────────────────────────────────
 elif page == "Dawn Chorus Overview":
 
@@ -3707,16 +5438,13 @@ elif page == "Dawn Chorus Overview":
         dc_df = dc_df[dc_df["Com_Name"].isin(top_dawn)].copy()
         dc_df["date"] = dc_df["timestamp"].dt.date
 
-        # Open-Meteo sunrise is in GMT (smooth). Detections are in local time.
-        # In UTC mode: convert detections local→UTC so both align with sunrise.
-        # In local mode: use raw detection hours; shift sunrise by +1 during BST.
+        # In UTC mode both detections and sunrise are shown in UTC (a smooth
+        # sunrise curve); in local mode both are local, so sunrise steps by an
+        # hour at the clock changes.
         use_utc = dc_time_mode == "UTC"
-        if use_utc:
-            dc_df["decimal_hour"] = to_utc_hour(dc_df["timestamp"])
-            hour_label = "Hour (UTC)"
-        else:
-            dc_df["decimal_hour"] = dc_df["timestamp"].dt.hour + dc_df["timestamp"].dt.minute / 60.0
-            hour_label = "Hour (local)"
+        dc_time_col = "timestamp_utc" if use_utc else "timestamp"
+        dc_df["decimal_hour"] = decimal_hour(dc_df[dc_time_col])
+        hour_label = "Hour (UTC)" if use_utc else "Hour (local)"
 
         earliest = (
             dc_df.groupby(["date", "Com_Name"])["decimal_hour"]
@@ -3738,25 +5466,15 @@ elif page == "Dawn Chorus Overview":
         fig.update_traces(marker=dict(size=5, opacity=0.7))
 
         # Always show sunrise
-        w_lat = float(dc_df["Lat"].mode().iloc[0])
-        w_lon = float(dc_df["Lon"].mode().iloc[0])
-        w_start = dc_df["timestamp"].min().strftime("%Y-%m-%d")
-        w_end = dc_df["timestamp"].max().strftime("%Y-%m-%d")
-        _, sunrise_daily = fetch_weather(w_lat, w_lon, w_start, w_end)
-        if sunrise_daily is not None and "sunrise" in sunrise_daily.columns:
-            sunrise_daily = sunrise_daily.copy()
-            if use_utc:
-                # Sunrise from Open-Meteo is already GMT/UTC
-                sunrise_daily["sunrise_hour"] = (
-                    sunrise_daily["sunrise"].dt.hour + sunrise_daily["sunrise"].dt.minute / 60.0
-                )
-            else:
-                # Convert GMT sunrise to local time (add 1 hour during BST)
-                sunrise_daily["sunrise_hour"] = sunrise_daily["sunrise"].apply(
-                    lambda t: t.replace(tzinfo=_TZ_UTC).astimezone(_TZ_LONDON)
-                ).dt.hour + sunrise_daily["sunrise"].apply(
-                    lambda t: t.replace(tzinfo=_TZ_UTC).astimezone(_TZ_LONDON)
-                ).dt.minute / 60.0
+        if station_located:
+            sunrise_daily = sun_table(
+                station_lat, station_lon,
+                dc_df["timestamp"].min().date(), dc_df["timestamp"].max().date(),
+            )
+            sunrise_col = "sunrise_utc" if use_utc else "sunrise"
+            sunrise_daily["sunrise_hour"] = (
+                sunrise_daily[sunrise_col].dt.hour + sunrise_daily[sunrise_col].dt.minute / 60.0
+            )
             fig.add_scatter(
                 x=sunrise_daily["date"], y=sunrise_daily["sunrise_hour"],
                 mode="lines", line=dict(color="#c47a5a", width=2.5, dash="dash"),
@@ -3783,79 +5501,67 @@ elif page == "Dawn Chorus Overview":
 
         # Earliest detection per day
         fds_earliest = (
-            fds_df.groupby("date")["timestamp"]
+            fds_df.groupby("date")["timestamp_utc" if fds_utc else "timestamp"]
             .min()
             .reset_index(name="earliest_detection")
         )
-        if fds_utc:
-            fds_earliest["earliest_hour"] = to_utc_hour(fds_earliest["earliest_detection"])
-        else:
-            fds_earliest["earliest_hour"] = (
-                fds_earliest["earliest_detection"].dt.hour
-                + fds_earliest["earliest_detection"].dt.minute / 60.0
+        fds_earliest["earliest_hour"] = decimal_hour(fds_earliest["earliest_detection"])
+
+        if station_located:
+            fds_start = fds_df["timestamp"].min()
+            fds_end = fds_df["timestamp"].max()
+            sunrise_df = sun_table(station_lat, station_lon, fds_start.date(), fds_end.date()).dropna(subset=["sunrise"])
+            sunrise_col = "sunrise_utc" if fds_utc else "sunrise"
+            sunrise_df["sunrise_hour"] = (
+                sunrise_df[sunrise_col].dt.hour + sunrise_df[sunrise_col].dt.minute / 60.0
             )
 
-        # Fetch weather for sunrise data
-        fds_lat = float(fds_df["Lat"].mode().iloc[0])
-        fds_lon = float(fds_df["Lon"].mode().iloc[0])
-        fds_start = fds_df["timestamp"].min().strftime("%Y-%m-%d")
-        fds_end = fds_df["timestamp"].max().strftime("%Y-%m-%d")
-        fds_weather_hourly, fds_weather_daily = fetch_weather(fds_lat, fds_lon, fds_start, fds_end)
-
-        if fds_weather_daily is not None and "sunrise" in fds_weather_daily.columns:
-            sunrise_df = fds_weather_daily[["date", "sunrise"]].copy()
-            if fds_utc:
-                sunrise_df["sunrise_hour"] = (
-                    sunrise_df["sunrise"].dt.hour + sunrise_df["sunrise"].dt.minute / 60.0
+            # Temperature in the (local) hour of sunrise; Open-Meteo hours are local
+            fds_weather_hourly, _ = fetch_weather(
+                station_lat, station_lon, fds_start.strftime("%Y-%m-%d"), fds_end.strftime("%Y-%m-%d"),
+            )
+            sunrise_df["hour"] = sunrise_df["sunrise"].dt.hour
+            if fds_weather_hourly is not None and len(fds_weather_hourly):
+                sunrise_df = sunrise_df.merge(
+                    fds_weather_hourly[["date", "hour", "temperature"]].drop_duplicates(["date", "hour"]),
+                    on=["date", "hour"],
+                    how="left",
                 )
             else:
-                _sr_local = sunrise_df["sunrise"].apply(
-                    lambda t: t.replace(tzinfo=_TZ_UTC).astimezone(_TZ_LONDON)
-                )
-                sunrise_df["sunrise_hour"] = _sr_local.dt.hour + _sr_local.dt.minute / 60.0
-
-            # Temperature at sunrise hour
-            sunrise_temps = []
-            for _, row in sunrise_df.iterrows():
-                sr_row = fds_weather_daily[fds_weather_daily["date"] == row["date"]]
-                if len(sr_row):
-                    sr_hour = int(sr_row.iloc[0]["sunrise"].hour)
-                else:
-                    sr_hour = 6
-                match = fds_weather_hourly[
-                    (fds_weather_hourly["date"] == row["date"]) & (fds_weather_hourly["hour"] == sr_hour)
-                ] if fds_weather_hourly is not None else pd.DataFrame()
-                temp = match["temperature"].iloc[0] if len(match) > 0 else None
-                sunrise_temps.append({"date": row["date"], "sunrise_hour": row["sunrise_hour"],
-                                      "sunrise_temp": temp})
-            sunrise_temp_df = pd.DataFrame(sunrise_temps)
-
-            fds_merged = fds_earliest.merge(sunrise_temp_df, on="date", how="inner")
-            fds_merged = fds_merged.dropna(subset=["sunrise_temp"])
+                sunrise_df["temperature"] = np.nan
+            sunrise_df = sunrise_df.rename(columns={"temperature": "sunrise_temp"})
+
+            fds_merged = fds_earliest.merge(
+                sunrise_df[["date", "sunrise_hour", "sunrise_temp"]], on="date", how="inner",
+            )
+            fds_temp = fds_merged.dropna(subset=["sunrise_temp"])
 
             hour_suffix = "UTC" if fds_utc else "local"
 
             if len(fds_merged) == 0:
-                st.info("No matching weather data for dawn detections.")
+                st.info("No sunrise times for the dawn detections.")
             else:
                 d_l2, d_r2 = st.columns(2, gap="large")
                 with d_l2:
-                    fig = px.scatter(
-                        fds_merged, x="sunrise_temp", y="earliest_hour",
-                        title="First Detection vs Sunrise Temperature",
-                        labels={"sunrise_temp": "Temperature at sunrise (°C)",
-                                "earliest_hour": f"Earliest detection ({hour_suffix})"},
-                        hover_data={"date": True},
-                    )
-                    fig.update_traces(marker=dict(size=8, color=PRIMARY, opacity=0.7))
-                    if len(fds_merged) > 2:
-                        z = np.polyfit(fds_merged["sunrise_temp"], fds_merged["earliest_hour"], 1)
-                        x_range = np.linspace(fds_merged["sunrise_temp"].min(),
-                                              fds_merged["sunrise_temp"].max(), 50)
-                        fig.add_scatter(x=x_range, y=np.polyval(z, x_range),
-                                        mode="lines", line=dict(color=TERTIARY, width=2, dash="dash"),
-                                        name="Trend", showlegend=True)
-                    st.plotly_chart(style_fig(fig), width="stretch")
+                    if len(fds_temp) == 0:
+                        st.info("No matching weather data for dawn detections.")
+                    else:
+                        fig = px.scatter(
+                            fds_temp, x="sunrise_temp", y="earliest_hour",
+                            title="First Detection vs Sunrise Temperature",
+                            labels={"sunrise_temp": "Temperature at sunrise (°C)",
+                                    "earliest_hour": f"Earliest detection ({hour_suffix})"},
+                            hover_data={"date": True},
+                        )
+                        fig.update_traces(marker=dict(size=8, color=PRIMARY, opacity=0.7))
+                        if len(fds_temp) > 2:
+                            z = np.polyfit(fds_temp["sunrise_temp"], fds_temp["earliest_hour"], 1)
+                            x_range = np.linspace(fds_temp["sunrise_temp"].min(),
+                                                  fds_temp["sunrise_temp"].max(), 50)
+                            fig.add_scatter(x=x_range, y=np.polyval(z, x_range),
+                                            mode="lines", line=dict(color=TERTIARY, width=2, dash="dash"),
+                                            name="Trend", showlegend=True)
+                        st.plotly_chart(style_fig(fig), width="stretch")
 
                 with d_r2:
                     fig = px.scatter(
@@ -3874,7 +5580,7 @@ elif page == "Dawn Chorus Overview":
                                     name="Sunrise = Detection", showlegend=True)
                     st.plotly_chart(style_fig(fig), width="stretch")
         else:
-            st.info("Could not fetch sunrise data.")
+            st.info("Station location unknown, so sunrise times are unavailable.")
 
 # ── Weather & Activity ──────────────────────────────────────────────────────
 elif page == "Weather & Activity":
@@ -3883,14 +5589,14 @@ elif page == "Weather & Activity":
 
     if len(w_df) == 0:
         st.info("No detection data available for weather analysis.")
+    elif not station_located:
+        st.warning("No location data available for your station.")
     else:
         # Get location and date range from the data
-        w_lat = float(w_df["Lat"].mode().iloc[0])
-        w_lon = float(w_df["Lon"].mode().iloc[0])
         w_start = w_df["timestamp"].min().strftime("%Y-%m-%d")
         w_end = w_df["timestamp"].max().strftime("%Y-%m-%d")
 
-        weather_hourly, weather_daily = fetch_weather(w_lat, w_lon, w_start, w_end)
+        weather_hourly, weather_daily = fetch_weather(station_lat, station_lon, w_start, w_end)
 
         if weather_hourly is None or weather_daily is None:
             st.error("Could not fetch weather data from Open-Meteo.")
@@ -4123,20 +5829,46 @@ elif page == "Weather & Activity":
 # ── Data Quality ─────────────────────────────────────────────────
 elif page == "Data Quality":
 
+    # Per-species daily confidence histograms under the sidebar filters; the
+    # rankings and summaries below are read from these, not the raw rows.
+    conf_hist = confidence_histograms(
+        station_df, database_cache_signature(DB_PATH), metadata_signature(), selected_station,
+    )
+    hist_keys = filter_aggregate_table(
+        conf_hist["keys"],
+        species=species_list,
+        statuses=status_list,
+        start_date=start_date,
+        end_date=end_date,
+        years=selected_years if year_mode == "Select years" else [],
+        season=selected_season,
+        month=month_num_by_name[chosen_month] if month_mode == "Choose month" and chosen_month else None,
+        exclude_review=exclude_review,
+    )
+    hist_rows = hist_keys.index.to_numpy()
+    hist_counts = conf_hist["counts"][hist_rows].copy()
+    hist_sums = conf_hist["sums"][hist_rows].copy()
+    hist_counts[:, :confidence_bin(min_conf)] = 0
+    hist_sums[:, :confidence_bin(min_conf)] = 0
+
     # ── Confidence Distribution ──
     st.subheader("Confidence Distribution")
 
     cd_topn = st.slider("Top N species", 5, 30, 20, key="cd_topn")
     cd_box = st.checkbox("Overlay box plot", value=True, key="cd_box")
 
-    cd_df = filtered.dropna(subset=["Confidence"]).copy()
+    species_hist = pd.DataFrame(hist_counts).groupby(hist_keys["Com_Name"].to_numpy()).sum()
+    species_hist = species_hist[species_hist.sum(axis=1) > 0]
 
-    if len(cd_df) == 0:
+    if len(species_hist) == 0:
         st.info("No confidence data available.")
     else:
         # Sort species by median confidence
-        medians = cd_df.groupby("Com_Name")["Confidence"].median().sort_values()
+        medians = pd.Series(
+            histogram_quantile(species_hist.to_numpy(), 0.5), index=species_hist.index,
+        ).sort_values(kind="stable")
         top_cd = medians.tail(cd_topn).index.tolist()
+        cd_df = filtered.dropna(subset=["Confidence"])
         cd_df = cd_df[cd_df["Com_Name"].isin(top_cd)].copy()
         # Reorder by median
         species_order = medians.loc[medians.index.isin(top_cd)].index.tolist()
@@ -4173,7 +5905,8 @@ elif page == "Data Quality":
         default=fp_default, key="fp_statuses",
     )
 
-    fp_df = filtered[filtered["Confidence"] <= fp_thresh].copy()
+    # Below the threshold, on the histograms' 0.01 grid
+    fp_df = filtered[filtered["Confidence"] < fp_thresh].copy()
     if fp_statuses:
         fp_df = fp_df[fp_df["UK_Status"].isin(fp_statuses)].copy()
 
@@ -4195,10 +5928,23 @@ elif page == "Data Quality":
             st.plotly_chart(style_fig(fig), width="stretch")
 
         with fp_right:
+            fp_bin = confidence_bin(fp_thresh)
             summary = (
-                fp_df.groupby(["Com_Name", "UK_Status"])
-                .agg(Count=("Confidence", "size"), Avg_Confidence=("Confidence", "mean"))
+                hist_keys[["Com_Name", "UK_Status"]]
+                .assign(
+                    Count=hist_counts[:, :fp_bin].sum(axis=1),
+                    Confidence_Sum=hist_sums[:, :fp_bin].sum(axis=1, dtype=float),
+                )
+                .groupby(["Com_Name", "UK_Status"])[["Count", "Confidence_Sum"]]
+                .sum()
                 .reset_index()
+            )
+            summary = summary[summary["Count"] > 0]
+            if fp_statuses:
+                summary = summary[summary["UK_Status"].isin(fp_statuses)]
+            summary["Avg_Confidence"] = summary["Confidence_Sum"] / summary["Count"]
+            summary = (
+                summary.drop(columns="Confidence_Sum")
                 .sort_values("Avg_Confidence")
                 .rename(columns={"Com_Name": "Species", "UK_Status": "Status",
                                  "Avg_Confidence": "Avg Confidence"})
@@ -4573,26 +6319,8 @@ elif page == "Records":
     if len(pr_df) == 0:
         st.info("No data available.")
     else:
-        def longest_streak(dates):
-            """Compute longest run of consecutive days."""
-            if len(dates) == 0:
-                return 0
-            unique_days = sorted(set(dates))
-            best = 1
-            current = 1
-            for i in range(1, len(unique_days)):
-                if (unique_days[i] - unique_days[i - 1]).days == 1:
-                    current += 1
-                    best = max(best, current)
-                else:
-                    current = 1
-            return best
-
-        pr_df["det_date"] = pr_df["timestamp"].dt.date
         streak_data = (
-            pr_df.groupby("Com_Name")["det_date"]
-            .apply(lambda x: longest_streak(x.tolist()))
-            .reset_index(name="Longest_Streak")
+            longest_streak_table(build_streak_index(pr_df))
             .sort_values("Longest_Streak", ascending=False)
         )
 
@@ -4613,11 +6341,11 @@ elif page == "Records":
     with pheno_col2:
         pheno_metric = st.radio("Metric", ["Detections", "Days active"], horizontal=True, key="pheno_metric")
 
-    if len(filtered) > 0:
+    if len(agg_view) > 0:
         if pheno_metric == "Detections":
-            pheno_agg = filtered.groupby(["Com_Name", "month"]).size().reset_index(name="value")
+            pheno_agg = tally(agg_view, ["Com_Name", "month"], weighted).reset_index(name="value")
         else:
-            pheno_agg = filtered.groupby(["Com_Name", "month"])["Date"].nunique().reset_index(name="value")
+            pheno_agg = agg_view.groupby(["Com_Name", "month"])["date"].nunique().reset_index(name="value")
 
         pheno_totals = pheno_agg.groupby("Com_Name")["value"].sum().nlargest(pheno_top_n)
         pheno_species = pheno_totals.index.tolist()
@@ -4691,11 +6419,11 @@ elif page == "Nearby Sightings":
     st.caption("Recent bird observations from iNaturalist near your recording station.")
 
     # Extract station location
-    if "Lat" not in df.columns or "Lon" not in df.columns or df["Lat"].dropna().empty:
+    if not station_located:
         st.warning("No location data available for your station.")
     else:
-        stn_lat = 52.2387
-        stn_lon = 0.2477
+        stn_lat = station_lat
+        stn_lon = station_lon
 
         col_r, col_d, col_reset = st.columns([1, 1, 0.5])
         with col_r: